@@ -6,10 +6,15 @@ using python-dotenv.
 
 import os
 from dataclasses import dataclass
+from typing import Optional
+
 from dotenv import load_dotenv
 
+# Cached configuration singleton
+_cached_config: Optional["Config"] = None
+
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Configuration settings for tele-convo.
 
@@ -21,6 +26,12 @@ class Config:
         db_path: SQLite database path.
         ws_host: WebSocket server host.
         ws_port: WebSocket server port.
+        processing_batch_size: How many backfilled messages to buffer
+            before handing them to the processing stage.
+        store_raw_json: Whether to store a message's full Telethon
+            to_dict() serialization alongside the structured columns
+            (kept only for messages with media, entities, or forward
+            info — a plain text row captures everything already).
     """
     api_id: int
     api_hash: str
@@ -29,13 +40,23 @@ class Config:
     db_path: str
     ws_host: str
     ws_port: int
+    processing_batch_size: int = 1000
+    store_raw_json: bool = False
+
+
+def reset_config_cache() -> None:
+    """Clear the cached configuration (mainly for tests)."""
+    global _cached_config
+    _cached_config = None
 
 
 def load_config() -> Config:
     """Load configuration from environment variables.
 
     Loads environment variables from .env file, validates required
-    variables, and returns a Config instance.
+    variables, and returns a Config instance. The parsed Config is
+    memoized, so repeated calls (e.g. from the database layer) skip
+    re-reading the .env file and the environment.
 
     Returns:
         Config: A configuration instance with all settings.
@@ -43,12 +64,20 @@ def load_config() -> Config:
     Raises:
         ValueError: If required environment variables are missing or invalid.
     """
+    global _cached_config
+
+    if _cached_config is not None:
+        return _cached_config
+
     load_dotenv()
 
+    # Snapshot the environment once instead of repeated getenv calls
+    env = os.environ.copy()
+
     # Required variables
-    api_id_str = os.getenv("API_ID")
-    api_hash = os.getenv("API_HASH")
-    group_url = os.getenv("GROUP_URL")
+    api_id_str = env.get("API_ID")
+    api_hash = env.get("API_HASH")
+    group_url = env.get("GROUP_URL")
 
     # Validate required variables
     missing_vars = []
@@ -73,12 +102,12 @@ def load_config() -> Config:
         )
 
     # Optional variables with defaults
-    session_name = os.getenv("SESSION_NAME", "tele_convo")
-    db_path = os.getenv("DB_PATH", "data/messages.db")
-    ws_host = os.getenv("WS_HOST", "0.0.0.0")
+    session_name = env.get("SESSION_NAME", "tele_convo")
+    db_path = env.get("DB_PATH", "data/messages.db")
+    ws_host = env.get("WS_HOST", "0.0.0.0")
 
     # Parse WS_PORT as integer
-    ws_port_str = os.getenv("WS_PORT", "8765")
+    ws_port_str = env.get("WS_PORT", "8765")
     try:
         ws_port = int(ws_port_str)
     except ValueError:
@@ -86,7 +115,19 @@ def load_config() -> Config:
             f"WS_PORT must be an integer, got: '{ws_port_str}'"
         )
 
-    return Config(
+    # Parse PROCESSING_BATCH_SIZE as integer
+    batch_size_str = env.get("PROCESSING_BATCH_SIZE", "1000")
+    try:
+        processing_batch_size = int(batch_size_str)
+    except ValueError:
+        raise ValueError(
+            f"PROCESSING_BATCH_SIZE must be an integer, got: '{batch_size_str}'"
+        )
+
+    # Parse STORE_RAW_JSON as boolean
+    store_raw_json = env.get("STORE_RAW_JSON", "false").lower() in ("1", "true", "yes")
+
+    _cached_config = Config(
         api_id=api_id,
         api_hash=api_hash,  # type: ignore[arg-type]
         session_name=session_name,
@@ -94,4 +135,7 @@ def load_config() -> Config:
         db_path=db_path,
         ws_host=ws_host,
         ws_port=ws_port,
+        processing_batch_size=processing_batch_size,
+        store_raw_json=store_raw_json,
     )
+    return _cached_config
@@ -5,24 +5,79 @@ initialization, CRUD operations, pagination, and full-text search.
 """
 
 import asyncio
-import base64
+import functools
 import json
 import os
+import struct
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Optional
 
 import aiosqlite
 
+# pybase64 exposes the stdlib API but uses SIMD encode/decode loops,
+# which is worth having on the per-request cursor path when installed.
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from tele_convo.config import Config, load_config
 
 
-# Database connection singleton
-_db_connection: Optional[aiosqlite.Connection] = None
+@dataclass(slots=True)
+class _ReadWritePool:
+    """Connection pool holding one writer and N read-only readers.
+
+    Under WAL mode readers never block the writer (and vice versa), so a
+    single write connection plus a small set of read-only connections lets
+    concurrent SELECTs proceed in parallel instead of queueing behind a
+    shared connection.
+
+    Attributes:
+        writer: The single read-write connection used for all writes.
+        readers: Queue of read-only connections shared by SELECT helpers.
+    """
+    writer: aiosqlite.Connection
+    readers: asyncio.Queue
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """A single queued write awaiting the next group commit.
+
+    Attributes:
+        sql: SQL statement to execute.
+        params: Bound parameters for the statement.
+        future: Resolved once the statement's transaction commits.
+    """
+    sql: str
+    params: tuple
+    future: asyncio.Future
+
+
+# Database connection pool singleton
+_db_pool: Optional[_ReadWritePool] = None
 _init_lock = asyncio.Lock()
 
+# Bumped on every chat write so read-side caches can invalidate
+_chats_version = 0
+
+# Background write-coalescing queue (group commit)
+_write_queue: Optional[asyncio.Queue] = None
+_flusher_task: Optional[asyncio.Task] = None
+_FLUSH_INTERVAL = 0.02  # seconds to wait for more writes before committing
+_FLUSH_MAX_BATCH = 256  # maximum writes coalesced into one transaction
+
+# Per-connection prepared-statement cache size. All hot statements are
+# module-level constants, so with enough slots every repeat query reuses
+# its compiled plan instead of re-parsing (sqlite3's default is 128,
+# which the filter variants plus FTS and CRUD statements can exceed).
+_STATEMENT_CACHE_SIZE = 256
+
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """Chat entity representing a Telegram chat/channel.
 
@@ -36,7 +91,7 @@ class Chat:
     username: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User entity representing a Telegram user.
 
@@ -52,7 +107,7 @@ class User:
     last_name: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Message:
     """Message entity representing a Telegram message.
 
@@ -60,23 +115,45 @@ class Message:
         id: Unique message identifier.
         chat_id: Chat identifier this message belongs to.
         sender_id: User identifier who sent the message.
-        date: Message date/time.
+        date: Message date/time as an ISO string (a datetime is accepted
+            on construction and normalized by the insert helpers).
         text: Message text content.
         reply_to_msg_id: Reply message ID (optional).
         is_forwarded: Whether message was forwarded.
-        raw_json: Raw JSON representation of the message.
+        raw_json: Raw JSON representation of the message; stored as
+            UTF-8 bytes to skip a decode/encode round trip on ingest
+            (SQLite keeps bytes values as BLOBs), str is accepted too.
     """
     id: int
     chat_id: int
     sender_id: int
-    date: datetime
+    date: datetime | str
     text: Optional[str] = None
     reply_to_msg_id: Optional[int] = None
     is_forwarded: bool = False
-    raw_json: Optional[str] = None
+    raw_json: Optional[str | bytes] = None
 
+    @property
+    def date_dt(self) -> datetime:
+        """Message date parsed to a datetime, lazily.
 
-@dataclass
+        Rows come back from SQLite with ISO date strings, and most
+        consumers (the JSON-RPC responses) re-serialize straight back to
+        ISO — so the string is kept as-is and only parsed on demand.
+        """
+        if isinstance(self.date, str):
+            return datetime.fromisoformat(self.date)
+        return self.date
+
+    @property
+    def date_str(self) -> str:
+        """Message date as an ISO string, whichever form it was given in."""
+        if isinstance(self.date, str):
+            return self.date
+        return self.date.isoformat()
+
+
+@dataclass(slots=True)
 class Media:
     """Media entity representing message media attachment.
 
@@ -92,10 +169,12 @@ class Media:
     media_id: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageCursor:
     """Cursor for paginating through messages.
 
+    Frozen so decoded cursors are safely shareable from the decode cache.
+
     Attributes:
         last_id: Last message ID from previous page.
         last_date: Last message date from previous page.
@@ -104,60 +183,113 @@ class MessageCursor:
     last_date: str
 
 
+# Binary cursor layout: message id, microseconds since epoch, tz-aware flag.
+# Fixed-size struct packing avoids a JSON round trip on every page fetch.
+_CURSOR_STRUCT = struct.Struct("<qqb")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
 def encode_cursor(cursor: MessageCursor) -> str:
-    """Encode a message cursor to base64 string for transmission.
+    """Encode a message cursor to a compact urlsafe-base64 string.
 
     Args:
         cursor: The message cursor to encode.
 
     Returns:
-        Base64 encoded cursor string.
+        Urlsafe-base64 encoded cursor string (fixed 23 characters).
     """
-    data = {
-        "last_id": cursor.last_id,
-        "last_date": cursor.last_date
-    }
-    json_str = json.dumps(data)
-    return base64.b64encode(json_str.encode()).decode()
+    dt = datetime.fromisoformat(cursor.last_date)
+    aware = dt.tzinfo is not None
+    if aware:
+        dt = dt.astimezone(timezone.utc)
+    else:
+        dt = dt.replace(tzinfo=timezone.utc)
+    micros = (dt - _EPOCH) // _MICROSECOND
+    payload = _CURSOR_STRUCT.pack(cursor.last_id, micros, 1 if aware else 0)
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
 
 
+@functools.lru_cache(maxsize=1024)
 def decode_cursor(cursor_str: str) -> Optional[MessageCursor]:
-    """Decode a base64 cursor string to MessageCursor.
+    """Decode a cursor string to MessageCursor.
+
+    Accepts both the current struct-packed format and the legacy
+    base64-encoded JSON format. The struct unpack is attempted first —
+    its fixed 17-byte payload cannot successfully decode a legacy JSON
+    cursor, whereas sniffing the base64 prefix can misclassify a binary
+    cursor whose payload happens to start with '{"'. Decoded cursors are
+    memoized: clients paging through a result set resubmit each cursor
+    with every filter variation they try, so the cache turns repeat
+    decodes into a dict hit.
 
     Args:
-        cursor_str: Base64 encoded cursor string.
+        cursor_str: Encoded cursor string.
 
     Returns:
         MessageCursor object or None if invalid.
     """
     try:
-        json_bytes = base64.b64decode(cursor_str.encode())
-        data = json.loads(json_bytes.decode())
+        padded = cursor_str + "=" * (-len(cursor_str) % 4)
+        last_id, micros, aware = _CURSOR_STRUCT.unpack(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        dt = _EPOCH + micros * _MICROSECOND
+        if not aware:
+            dt = dt.replace(tzinfo=None)
+        return MessageCursor(last_id=last_id, last_date=dt.isoformat())
+    except (ValueError, struct.error):
+        pass
+
+    try:
+        # Legacy format: base64 of a JSON object
+        data = json.loads(base64.b64decode(cursor_str.encode()).decode())
         return MessageCursor(
             last_id=data["last_id"],
             last_date=data["last_date"]
         )
-    except (ValueError, KeyError, json.JSONDecodeError):
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError):
         return None
 
 
-async def get_db_connection(config: Optional[Config] = None) -> aiosqlite.Connection:
-    """Get or create the database connection singleton.
+async def _tune_connection(conn: aiosqlite.Connection) -> None:
+    """Apply the server-tuned PRAGMA set to a connection.
+
+    Larger page cache, in-memory temp storage and memory-mapped I/O cut
+    repeated read syscalls on the paginated SELECT and FTS paths, while
+    busy_timeout avoids spurious SQLITE_BUSY errors under concurrency.
+
+    Args:
+        conn: Database connection to configure.
+    """
+    await conn.execute("PRAGMA busy_timeout=5000")
+    await conn.execute("PRAGMA cache_size=-20000")  # 20 MB page cache
+    await conn.execute("PRAGMA temp_store=MEMORY")
+    await conn.execute("PRAGMA foreign_keys=ON")
+    await conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+
+
+async def _get_pool(config: Optional[Config] = None) -> _ReadWritePool:
+    """Get or create the database connection pool singleton.
+
+    Opens the single writer connection first (creating the database file
+    and schema if needed), then a queue of read-only connections sized to
+    the CPU count so WAL readers can run concurrently.
 
     Args:
         config: Configuration object. If not provided, loads from environment.
 
     Returns:
-        Database connection instance.
+        The shared connection pool.
     """
-    global _db_connection
+    global _db_pool
 
-    if _db_connection is not None:
-        return _db_connection
+    if _db_pool is not None:
+        return _db_pool
 
     async with _init_lock:
-        if _db_connection is not None:
-            return _db_connection
+        if _db_pool is not None:
+            return _db_pool
 
         if config is None:
             config = load_config()
@@ -167,142 +299,439 @@ async def get_db_connection(config: Optional[Config] = None) -> aiosqlite.Connec
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
-        _db_connection = await aiosqlite.connect(config.db_path)
-        _db_connection.row_factory = aiosqlite.Row
+        writer = await aiosqlite.connect(
+            config.db_path, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        writer.row_factory = aiosqlite.Row
 
         # Enable WAL mode for better concurrency
-        await _db_connection.execute("PRAGMA journal_mode=WAL")
-        await _db_connection.execute("PRAGMA synchronous=NORMAL")
+        await writer.execute("PRAGMA journal_mode=WAL")
+        await writer.execute("PRAGMA synchronous=NORMAL")
+        await writer.execute("PRAGMA wal_autocheckpoint=1000")
+        await _tune_connection(writer)
+
+        await _init_schema(writer)
+
+        # Open read-only connections after the schema exists on disk
+        readers: asyncio.Queue = asyncio.Queue()
+        for _ in range(os.cpu_count() or 1):
+            reader = await aiosqlite.connect(
+                f"file:{config.db_path}?mode=ro",
+                uri=True,
+                cached_statements=_STATEMENT_CACHE_SIZE
+            )
+            reader.row_factory = aiosqlite.Row
+            await _tune_connection(reader)
+            # Belt and braces on top of mode=ro: query_only makes any
+            # write attempt on a pooled reader an immediate error
+            # instead of a lock acquisition.
+            await reader.execute("PRAGMA query_only=1")
+            readers.put_nowait(reader)
+
+        _db_pool = _ReadWritePool(writer=writer, readers=readers)
+
+        # Start the group-commit flusher for single-row writes
+        global _write_queue, _flusher_task
+        _write_queue = asyncio.Queue()
+        _flusher_task = asyncio.create_task(_write_flusher())
+
+    return _db_pool
+
+
+@asynccontextmanager
+async def acquire_reader() -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a read-only connection from the pool.
+
+    Yields:
+        A read-only database connection, returned to the pool on exit.
+    """
+    pool = await _get_pool()
+    conn = await pool.readers.get()
+    try:
+        yield conn
+    finally:
+        pool.readers.put_nowait(conn)
 
-        await _init_schema(_db_connection)
 
-    return _db_connection
+@asynccontextmanager
+async def acquire_writer() -> AsyncIterator[aiosqlite.Connection]:
+    """Acquire the single read-write connection.
+
+    Yields:
+        The shared writer connection.
+    """
+    pool = await _get_pool()
+    yield pool.writer
+
+
+@asynccontextmanager
+async def write_tx() -> AsyncIterator[aiosqlite.Connection]:
+    """Run a write transaction that takes the write lock up front.
+
+    BEGIN IMMEDIATE acquires the write lock at transaction start, so the
+    transaction can never hit the SQLITE_BUSY upgrade race a deferred
+    transaction faces when it escalates from read to write. Commits on
+    success, rolls back on error.
+
+    Yields:
+        The writer connection with an open immediate transaction.
+    """
+    async with acquire_writer() as conn:
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
+        else:
+            await conn.commit()
+
+
+async def _write_flusher() -> None:
+    """Drain queued writes and commit them in coalesced batches.
+
+    Waits up to _FLUSH_INTERVAL for additional writes after the first one
+    arrives, then executes the whole batch inside a single BEGIN IMMEDIATE
+    transaction. A burst of single-row inserts therefore pays one fsync
+    instead of one per statement. A None sentinel stops the task.
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        item = await _write_queue.get()
+        if item is None:
+            return
+
+        batch = [item]
+        deadline = loop.time() + _FLUSH_INTERVAL
+        stop = False
+        while len(batch) < _FLUSH_MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                nxt = await asyncio.wait_for(_write_queue.get(), timeout)
+            except TimeoutError:
+                break
+            if nxt is None:
+                stop = True
+                break
+            batch.append(nxt)
+
+        try:
+            async with write_tx() as conn:
+                for write in batch:
+                    await conn.execute(write.sql, write.params)
+        except Exception as e:
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(e)
+        else:
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_result(None)
+
+        if stop:
+            return
+
+
+async def _enqueue_write(sql: str, params: tuple, immediate: bool = False) -> None:
+    """Submit a single write for the next group commit.
+
+    Args:
+        sql: SQL statement to execute.
+        params: Bound parameters for the statement.
+        immediate: If True, bypass the queue and commit synchronously.
+    """
+    await _get_pool()
+
+    if immediate or _write_queue is None:
+        async with write_tx() as conn:
+            await conn.execute(sql, params)
+        return
+
+    future = asyncio.get_running_loop().create_future()
+    await _write_queue.put(_PendingWrite(sql=sql, params=params, future=future))
+    await future
+
+
+async def get_db_connection(config: Optional[Config] = None) -> aiosqlite.Connection:
+    """Get the writer connection, creating the pool if needed.
+
+    Kept for callers (e.g. application startup) that only need to ensure
+    the database is initialized. Query helpers should use acquire_reader /
+    acquire_writer instead.
+
+    Args:
+        config: Configuration object. If not provided, loads from environment.
+
+    Returns:
+        The read-write database connection.
+    """
+    pool = await _get_pool(config)
+    return pool.writer
 
 
 async def _init_schema(conn: aiosqlite.Connection) -> None:
     """Initialize database schema with all tables and FTS.
 
+    The full DDL runs as one executescript call, so startup pays a single
+    round trip through the aiosqlite worker thread instead of one per
+    statement. Every statement keeps IF NOT EXISTS for idempotence.
+
     Args:
         conn: Database connection.
     """
-    # Create CHATS table
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS chats (
-            id INTEGER PRIMARY KEY,
-            title TEXT NOT NULL,
-            username TEXT
-        )
-    """)
-
-    # Create USERS table
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT,
-            first_name TEXT NOT NULL,
-            last_name TEXT
-        )
-    """)
-
-    # Create MESSAGES table
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS messages (
-            id INTEGER PRIMARY KEY,
-            chat_id INTEGER NOT NULL,
-            sender_id INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            text TEXT,
-            reply_to_msg_id INTEGER,
-            is_forwarded INTEGER DEFAULT 0,
-            raw_json TEXT,
-            FOREIGN KEY (chat_id) REFERENCES chats(id),
-            FOREIGN KEY (sender_id) REFERENCES users(id)
-        )
-    """)
-
-    # Create indexes for MESSAGES table
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_messages_chat_id ON messages(chat_id)
-    """)
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages(sender_id)
-    """)
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(date)
-    """)
-
-    # Create MEDIA table
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS media (
-            msg_id INTEGER NOT NULL,
-            chat_id INTEGER NOT NULL,
-            media_type TEXT NOT NULL,
-            media_id TEXT NOT NULL,
-            PRIMARY KEY (msg_id, chat_id),
-            FOREIGN KEY (msg_id) REFERENCES messages(id),
-            FOREIGN KEY (chat_id) REFERENCES chats(id)
-        )
-    """)
-
-    # Create FTS5 virtual table for full-text search
-    await conn.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
-            text,
-            content='messages',
-            content_rowid='id'
-        )
-    """)
-
-    # Create triggers to keep FTS in sync with messages
-    await conn.execute("""
-        CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
-            INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
-        END
-    """)
-
-    await conn.execute("""
-        CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
-            INSERT INTO messages_fts(messages_fts, rowid, text) VALUES('delete', old.id, old.text);
-        END
-    """)
-
-    await conn.execute("""
-        CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
-            INSERT INTO messages_fts(messages_fts, rowid, text) VALUES('delete', old.id, old.text);
-            INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
-        END
-    """)
+    # users_fts postdates the users table: on a database upgraded in
+    # place the external-content index starts empty and its triggers
+    # only cover future writes. Detect first creation via sqlite_master
+    # (a bare SELECT on an external-content FTS table scans the content
+    # table, not the index, so it cannot tell an empty index apart) and
+    # index the pre-existing rows once.
+    async with conn.execute(
+        "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts')"
+    ) as cursor:
+        had_users_fts = (await cursor.fetchone())[0]
+
+    await conn.executescript(_SCHEMA_SQL)
+
+    if not had_users_fts:
+        await conn.execute("INSERT INTO users_fts(users_fts) VALUES('rebuild')")
 
     await conn.commit()
 
 
 async def close_db() -> None:
-    """Close the database connection."""
-    global _db_connection
+    """Flush pending writes and close all pooled database connections."""
+    global _db_pool, _write_queue, _flusher_task
+
+    if _flusher_task is not None:
+        _write_queue.put_nowait(None)
+        await _flusher_task
+        _flusher_task = None
+        _write_queue = None
+
+    if _db_pool is not None:
+        await _db_pool.writer.close()
+        while not _db_pool.readers.empty():
+            reader = _db_pool.readers.get_nowait()
+            await reader.close()
+        _db_pool = None
+
+
+# Kept as a constant so insert_messages_batch can drop and recreate the
+# trigger around bulk inserts (see below).
+_MESSAGES_AI_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+    END
+"""
+
+
+# Complete schema DDL executed in a single script at startup. The
+# composite (chat_id, date, id) messages index matches the seek-cursor
+# predicate and sort order exactly, so paginated chat queries stop after
+# touching limit+1 rows; the media index does the same for the chat
+# filter + msg_id seek. The old single-column chat_id index is dropped
+# in favor of the composite one.
+_SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS chats (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        username TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY,
+        username TEXT,
+        first_name TEXT NOT NULL,
+        last_name TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY,
+        chat_id INTEGER NOT NULL,
+        sender_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        text TEXT,
+        reply_to_msg_id INTEGER,
+        is_forwarded INTEGER DEFAULT 0,
+        raw_json TEXT,
+        FOREIGN KEY (chat_id) REFERENCES chats(id),
+        FOREIGN KEY (sender_id) REFERENCES users(id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_messages_chat_date_id
+    ON messages(chat_id, date DESC, id DESC);
+    DROP INDEX IF EXISTS idx_messages_chat_id;
+    CREATE INDEX IF NOT EXISTS idx_messages_sender_id ON messages(sender_id);
+    CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(date);
+
+    CREATE TABLE IF NOT EXISTS media (
+        msg_id INTEGER NOT NULL,
+        chat_id INTEGER NOT NULL,
+        media_type TEXT NOT NULL,
+        media_id TEXT NOT NULL,
+        PRIMARY KEY (msg_id, chat_id),
+        FOREIGN KEY (msg_id) REFERENCES messages(id),
+        FOREIGN KEY (chat_id) REFERENCES chats(id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_media_chat_msg
+    ON media(chat_id, msg_id DESC);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        text,
+        content='messages',
+        content_rowid='id'
+    );
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        username,
+        first_name,
+        last_name,
+        content='users',
+        content_rowid='id'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS users_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, username, first_name, last_name)
+        VALUES (new.id, new.username, new.first_name, new.last_name);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS users_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, first_name, last_name)
+        VALUES('delete', old.id, old.username, old.first_name, old.last_name);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS users_au AFTER UPDATE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, first_name, last_name)
+        VALUES('delete', old.id, old.username, old.first_name, old.last_name);
+        INSERT INTO users_fts(rowid, username, first_name, last_name)
+        VALUES (new.id, new.username, new.first_name, new.last_name);
+    END;
+
+    {_MESSAGES_AI_TRIGGER};
+
+    CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, text) VALUES('delete', old.id, old.text);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, text) VALUES('delete', old.id, old.text);
+        INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+    END;
+"""
+
+
+# ==================== SQL STATEMENTS ====================
+# Hoisted to module level so every call passes the same interned string,
+# which keeps SQLite's per-connection prepared-statement cache hot
+# instead of re-preparing freshly built statement text.
+
+_SQL_UPSERT_CHAT = """
+    INSERT INTO chats (id, title, username)
+    VALUES (?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        username = excluded.username
+"""
+
+_SQL_GET_CHAT = "SELECT id, title, username FROM chats WHERE id = ?"
 
-    if _db_connection is not None:
-        await _db_connection.close()
-        _db_connection = None
+_SQL_GET_ALL_CHATS = "SELECT id, title, username FROM chats ORDER BY title"
+
+_SQL_UPSERT_USER = """
+    INSERT INTO users (id, username, first_name, last_name)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        username = excluded.username,
+        first_name = excluded.first_name,
+        last_name = excluded.last_name
+"""
+
+_SQL_GET_USER = "SELECT id, username, first_name, last_name FROM users WHERE id = ?"
+
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO messages (id, chat_id, sender_id, date, text,
+                          reply_to_msg_id, is_forwarded, raw_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_MESSAGE_FTS = "INSERT INTO messages_fts(rowid, text) VALUES (?, ?)"
+
+_SQL_UPSERT_MEDIA = """
+    INSERT OR REPLACE INTO media (msg_id, chat_id, media_type, media_id)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _raw_message(row: aiosqlite.Row) -> dict[str, Any]:
+    """Convert a message row to a plain dict for JSON passthrough.
+
+    Used by the raw listing path: callers that only re-serialize to JSON
+    skip Message allocation and date handling entirely. is_forwarded is
+    coerced to bool so the wire format matches the dataclass path, and
+    the window-total helper column is dropped if present.
+
+    Args:
+        row: Message row from any of the listing queries.
+
+    Returns:
+        Dict with the message columns, ready for json serialization.
+    """
+    item = dict(row)
+    item["is_forwarded"] = bool(item["is_forwarded"])
+    item.pop("total_count", None)
+    return item
+
+
+def _fts_prefix_query(keyword: str) -> str:
+    """Build a quoted FTS5 prefix query from a plain keyword.
+
+    Quoting neutralizes FTS5 operator characters in the keyword; the
+    trailing * makes it a prefix match so partial words still hit.
+
+    Args:
+        keyword: Raw search keyword.
+
+    Returns:
+        FTS5 MATCH expression string.
+    """
+    escaped = keyword.replace('"', '""')
+    return f'"{escaped}"*'
 
 
 # ==================== CHATS CRUD ====================
 
 
-async def insert_or_update_chat(chat: Chat) -> None:
+def chats_version() -> int:
+    """Get the monotonic chat-write counter.
+
+    Read-side caches (e.g. the server's getChats cache) compare this
+    against the version they cached at to detect staleness without a
+    database round trip.
+
+    Returns:
+        Counter value, bumped on every chat write.
+    """
+    return _chats_version
+
+
+async def insert_or_update_chat(chat: Chat, immediate: bool = False) -> None:
     """Insert or update a chat in the database.
 
     Args:
         chat: Chat entity to insert or update.
+        immediate: Commit synchronously instead of via the group-commit queue.
     """
-    conn = await get_db_connection()
-    await conn.execute("""
-        INSERT INTO chats (id, title, username)
-        VALUES (?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            title = excluded.title,
-            username = excluded.username
-    """, (chat.id, chat.title, chat.username))
-    await conn.commit()
+    global _chats_version
+    _chats_version += 1
+    await _enqueue_write(
+        _SQL_UPSERT_CHAT,
+        (chat.id, chat.title, chat.username),
+        immediate=immediate
+    )
 
 
 async def get_chat_by_id(chat_id: int) -> Optional[Chat]:
@@ -314,12 +743,9 @@ async def get_chat_by_id(chat_id: int) -> Optional[Chat]:
     Returns:
         Chat entity or None if not found.
     """
-    conn = await get_db_connection()
-    cursor = await conn.execute(
-        "SELECT id, title, username FROM chats WHERE id = ?",
-        (chat_id,)
-    )
-    row = await cursor.fetchone()
+    async with acquire_reader() as conn:
+        cursor = await conn.execute(_SQL_GET_CHAT, (chat_id,))
+        row = await cursor.fetchone()
 
     if row is None:
         return None
@@ -337,41 +763,33 @@ async def get_all_chats() -> list[Chat]:
     Returns:
         List of Chat entities.
     """
-    conn = await get_db_connection()
-    cursor = await conn.execute(
-        "SELECT id, title, username FROM chats ORDER BY title"
-    )
-    rows = await cursor.fetchall()
-
-    return [
-        Chat(
-            id=row["id"],
-            title=row["title"],
-            username=row["username"]
-        )
-        for row in rows
-    ]
+    async with acquire_reader() as conn:
+        cursor = await conn.execute(_SQL_GET_ALL_CHATS)
+        return [
+            Chat(
+                id=row["id"],
+                title=row["title"],
+                username=row["username"]
+            )
+            async for row in cursor
+        ]
 
 
 # ==================== USERS CRUD ====================
 
 
-async def insert_or_update_user(user: User) -> None:
+async def insert_or_update_user(user: User, immediate: bool = False) -> None:
     """Insert or update a user in the database.
 
     Args:
         user: User entity to insert or update.
+        immediate: Commit synchronously instead of via the group-commit queue.
     """
-    conn = await get_db_connection()
-    await conn.execute("""
-        INSERT INTO users (id, username, first_name, last_name)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            username = excluded.username,
-            first_name = excluded.first_name,
-            last_name = excluded.last_name
-    """, (user.id, user.username, user.first_name, user.last_name))
-    await conn.commit()
+    await _enqueue_write(
+        _SQL_UPSERT_USER,
+        (user.id, user.username, user.first_name, user.last_name),
+        immediate=immediate
+    )
 
 
 async def get_user_by_id(user_id: int) -> Optional[User]:
@@ -383,12 +801,9 @@ async def get_user_by_id(user_id: int) -> Optional[User]:
     Returns:
         User entity or None if not found.
     """
-    conn = await get_db_connection()
-    cursor = await conn.execute(
-        "SELECT id, username, first_name, last_name FROM users WHERE id = ?",
-        (user_id,)
-    )
-    row = await cursor.fetchone()
+    async with acquire_reader() as conn:
+        cursor = await conn.execute(_SQL_GET_USER, (user_id,))
+        row = await cursor.fetchone()
 
     if row is None:
         return None
@@ -416,40 +831,36 @@ async def search_users(
     Returns:
         Dictionary with users list and pagination info.
     """
-    conn = await get_db_connection()
-
-    if keyword:
-        search_pattern = f"%{keyword}%"
-        cursor = await conn.execute("""
-            SELECT id, username, first_name, last_name
-            FROM users
-            WHERE username LIKE ? OR first_name LIKE ? OR last_name LIKE ?
-            ORDER BY first_name, last_name
-            LIMIT ?
-        """, (search_pattern, search_pattern, search_pattern, limit + 1))
-    else:
-        cursor = await conn.execute("""
-            SELECT id, username, first_name, last_name
-            FROM users
-            ORDER BY first_name, last_name
-            LIMIT ?
-        """, (limit + 1,))
-
-    rows = await cursor.fetchall()
-
-    has_more = len(rows) > limit
-    if has_more:
-        rows = rows[:limit]
-
-    users = [
-        User(
-            id=row["id"],
-            username=row["username"],
-            first_name=row["first_name"],
-            last_name=row["last_name"]
-        )
-        for row in rows
-    ]
+    async with acquire_reader() as conn:
+        if keyword:
+            cursor = await conn.execute("""
+                SELECT u.id, u.username, u.first_name, u.last_name
+                FROM users u
+                JOIN users_fts ON u.id = users_fts.rowid
+                WHERE users_fts MATCH ?
+                ORDER BY u.first_name, u.last_name
+                LIMIT ?
+            """, (_fts_prefix_query(keyword), limit + 1))
+        else:
+            cursor = await conn.execute("""
+                SELECT id, username, first_name, last_name
+                FROM users
+                ORDER BY first_name, last_name
+                LIMIT ?
+            """, (limit + 1,))
+
+        users: list[User] = []
+        has_more = False
+        async for row in cursor:
+            if len(users) == limit:
+                has_more = True
+                break
+            users.append(User(
+                id=row["id"],
+                username=row["username"],
+                first_name=row["first_name"],
+                last_name=row["last_name"]
+            ))
 
     return {
         "users": users,
@@ -461,45 +872,189 @@ async def search_users(
 # ==================== MESSAGES CRUD ====================
 
 
-async def insert_message(message: Message) -> None:
+# Active-filter bits for the cached WHERE/SELECT builders below. The
+# filter combination fully determines the SQL text, so caching on the
+# bitmask skips per-request string assembly and means every call with
+# the same filters passes the identical (interned) statement to SQLite.
+_F_CHAT = 1
+_F_SENDER = 2
+_F_KEYWORD = 4
+_F_DATE_FROM = 8
+_F_DATE_TO = 16
+
+
+def _build_message_where(
+    chat_id: Optional[int],
+    sender_id: Optional[int],
+    keyword: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> tuple[int, list[Any]]:
+    """Collect the active-filter bitmask and bound parameters.
+
+    Args:
+        chat_id: Filter by chat ID.
+        sender_id: Filter by sender ID.
+        keyword: Search keyword in message text.
+        date_from: Filter messages from this date (ISO format).
+        date_to: Filter messages to this date (ISO format).
+
+    Returns:
+        Tuple of (filter bitmask, bound parameters in clause order).
+    """
+    mask = 0
+    params: list[Any] = []
+
+    if chat_id is not None:
+        mask |= _F_CHAT
+        params.append(chat_id)
+
+    if sender_id is not None:
+        mask |= _F_SENDER
+        params.append(sender_id)
+
+    if keyword:
+        mask |= _F_KEYWORD
+        params.append(_fts_prefix_query(keyword))
+
+    if date_from:
+        mask |= _F_DATE_FROM
+        params.append(date_from)
+
+    if date_to:
+        mask |= _F_DATE_TO
+        params.append(date_to)
+
+    return mask, params
+
+
+@functools.lru_cache(maxsize=None)
+def _message_where_sql(mask: int) -> str:
+    """Build the WHERE clause for an active-filter bitmask.
+
+    Cached: there are at most 32 variants, each assembled once.
+
+    Args:
+        mask: Active-filter bitmask from _build_message_where.
+
+    Returns:
+        WHERE clause string with ? placeholders in bitmask order.
+    """
+    conditions = []
+
+    if mask & _F_CHAT:
+        conditions.append("m.chat_id = ?")
+    if mask & _F_SENDER:
+        conditions.append("m.sender_id = ?")
+    if mask & _F_KEYWORD:
+        conditions.append(
+            "m.id IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?)"
+        )
+    if mask & _F_DATE_FROM:
+        conditions.append("m.date >= ?")
+    if mask & _F_DATE_TO:
+        conditions.append("m.date <= ?")
+
+    return " AND ".join(conditions) if conditions else "1=1"
+
+
+@functools.lru_cache(maxsize=None)
+def _filtered_select_sql(mask: int, with_cursor: bool, with_total: bool) -> str:
+    """Build the filtered message SELECT for a filter/cursor/total combo.
+
+    Args:
+        mask: Active-filter bitmask from _build_message_where.
+        with_cursor: Append the (date, id) seek predicate.
+        with_total: Append the COUNT(*) OVER () total column.
+
+    Returns:
+        Complete SELECT statement with ? placeholders.
+    """
+    where_clause = _message_where_sql(mask)
+    if with_cursor:
+        where_clause += " AND (m.date < ? OR (m.date = ? AND m.id < ?))"
+    total_column = ", COUNT(*) OVER () AS total_count" if with_total else ""
+    return f"""
+        SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
+               m.reply_to_msg_id, m.is_forwarded, m.raw_json{total_column}
+        FROM messages m
+        WHERE {where_clause}
+        ORDER BY m.date DESC, m.id DESC
+        LIMIT ?
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def _count_messages_sql(mask: int) -> str:
+    """Build the message COUNT statement for a filter bitmask.
+
+    Args:
+        mask: Active-filter bitmask from _build_message_where.
+
+    Returns:
+        Complete COUNT statement with ? placeholders.
+    """
+    return f"SELECT COUNT(*) as count FROM messages m WHERE {_message_where_sql(mask)}"
+
+
+async def insert_message(message: Message, immediate: bool = False) -> None:
     """Insert a message into the database.
 
     Args:
         message: Message entity to insert.
+        immediate: Commit synchronously instead of via the group-commit queue.
     """
-    conn = await get_db_connection()
-    await conn.execute("""
-        INSERT INTO messages (id, chat_id, sender_id, date, text, reply_to_msg_id, is_forwarded, raw_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    await _enqueue_write(_SQL_INSERT_MESSAGE, (
         message.id,
         message.chat_id,
         message.sender_id,
-        message.date.isoformat(),
+        message.date_str,
         message.text,
         message.reply_to_msg_id,
         1 if message.is_forwarded else 0,
         message.raw_json
-    ))
-    await conn.commit()
+    ), immediate=immediate)
 
 
-async def insert_messages_batch(messages: list[Message]) -> None:
-    """Insert multiple messages in a single transaction.
+async def insert_messages_batch(
+    messages: list[Message],
+    users: Optional[list[User]] = None,
+    chats: Optional[list[Chat]] = None,
+    media: Optional[list[Media]] = None
+) -> None:
+    """Insert messages plus their referenced entities in one transaction.
+
+    Upserting the senders, chats, and media alongside the messages means
+    a whole ingest chunk shares a single WAL commit (one fsync) instead
+    of paying one per referenced entity. Media is inserted after the
+    messages so its foreign key on messages(id) holds.
 
     Args:
         messages: List of message entities to insert.
+        users: Users referenced by the batch, upserted first (deduplicated
+            by id).
+        chats: Chats referenced by the batch, upserted first (deduplicated
+            by id).
+        media: Media attached to the batch, upserted last (deduplicated
+            by (msg_id, chat_id)).
     """
-    if not messages:
+    if not messages and not users and not chats and not media:
         return
 
-    conn = await get_db_connection()
+    chat_data = [
+        (c.id, c.title, c.username)
+        for c in {c.id: c for c in chats or []}.values()
+    ]
+    user_data = [
+        (u.id, u.username, u.first_name, u.last_name)
+        for u in {u.id: u for u in users or []}.values()
+    ]
     data = [
         (
             m.id,
             m.chat_id,
             m.sender_id,
-            m.date.isoformat(),
+            m.date_str,
             m.text,
             m.reply_to_msg_id,
             1 if m.is_forwarded else 0,
@@ -507,17 +1062,41 @@ async def insert_messages_batch(messages: list[Message]) -> None:
         )
         for m in messages
     ]
-    await conn.executemany("""
-        INSERT INTO messages (id, chat_id, sender_id, date, text, reply_to_msg_id, is_forwarded, raw_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, data)
-    await conn.commit()
+    fts_data = [(m.id, m.text) for m in messages]
+    media_data = [
+        (m.msg_id, m.chat_id, m.media_type, m.media_id)
+        for m in {(m.msg_id, m.chat_id): m for m in media or []}.values()
+    ]
+
+    # Sync FTS in a second executemany instead of letting the per-row
+    # AFTER INSERT trigger fire for every message; the trigger is dropped
+    # and recreated inside the same immediate transaction, so concurrent
+    # single-row inserts never observe the gap.
+    if chat_data:
+        global _chats_version
+        _chats_version += 1
+
+    async with write_tx() as conn:
+        if chat_data:
+            await conn.executemany(_SQL_UPSERT_CHAT, chat_data)
+        if user_data:
+            await conn.executemany(_SQL_UPSERT_USER, user_data)
+        if data:
+            await conn.execute("DROP TRIGGER IF EXISTS messages_ai")
+            try:
+                await conn.executemany(_SQL_INSERT_MESSAGE, data)
+                await conn.executemany(_SQL_INSERT_MESSAGE_FTS, fts_data)
+            finally:
+                await conn.execute(_MESSAGES_AI_TRIGGER)
+        if media_data:
+            await conn.executemany(_SQL_UPSERT_MEDIA, media_data)
 
 
 async def get_messages_by_chat(
     chat_id: int,
     limit: int = 50,
-    cursor: Optional[str] = None
+    cursor: Optional[str] = None,
+    raw: bool = False
 ) -> dict[str, Any]:
     """Get messages for a specific chat with pagination.
 
@@ -525,68 +1104,70 @@ async def get_messages_by_chat(
         chat_id: Chat identifier to filter by.
         limit: Maximum number of results.
         cursor: Base64 encoded pagination cursor.
+        raw: Return plain dicts instead of Message instances, skipping
+            per-row dataclass allocation for callers that re-serialize
+            straight to JSON.
 
     Returns:
         Dictionary with messages list and pagination info.
     """
-    conn = await get_db_connection()
-
     # Decode cursor if provided
     cursor_obj = decode_cursor(cursor) if cursor else None
 
-    if cursor_obj:
-        # Get messages older than cursor
-        cursor_query = await conn.execute("""
-            SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
-                   m.reply_to_msg_id, m.is_forwarded, m.raw_json
-            FROM messages m
-            WHERE m.chat_id = ? AND (m.date < ? OR (m.date = ? AND m.id < ?))
-            ORDER BY m.date DESC, m.id DESC
-            LIMIT ?
-        """, (
-            chat_id,
-            cursor_obj.last_date,
-            cursor_obj.last_date,
-            cursor_obj.last_id,
-            limit + 1
-        ))
-    else:
-        cursor_query = await conn.execute("""
-            SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
-                   m.reply_to_msg_id, m.is_forwarded, m.raw_json
-            FROM messages m
-            WHERE m.chat_id = ?
-            ORDER BY m.date DESC, m.id DESC
-            LIMIT ?
-        """, (chat_id, limit + 1))
-
-    rows = await cursor_query.fetchall()
-
-    has_more = len(rows) > limit
-    if has_more:
-        rows = rows[:limit]
-
-    messages = [
-        Message(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            sender_id=row["sender_id"],
-            date=datetime.fromisoformat(row["date"]),
-            text=row["text"],
-            reply_to_msg_id=row["reply_to_msg_id"],
-            is_forwarded=bool(row["is_forwarded"]),
-            raw_json=row["raw_json"]
-        )
-        for row in rows
-    ]
+    async with acquire_reader() as conn:
+        if cursor_obj:
+            # Get messages older than cursor
+            cursor_query = await conn.execute("""
+                SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
+                       m.reply_to_msg_id, m.is_forwarded, m.raw_json
+                FROM messages m
+                WHERE m.chat_id = ? AND (m.date < ? OR (m.date = ? AND m.id < ?))
+                ORDER BY m.date DESC, m.id DESC
+                LIMIT ?
+            """, (
+                chat_id,
+                cursor_obj.last_date,
+                cursor_obj.last_date,
+                cursor_obj.last_id,
+                limit + 1
+            ))
+        else:
+            cursor_query = await conn.execute("""
+                SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
+                       m.reply_to_msg_id, m.is_forwarded, m.raw_json
+                FROM messages m
+                WHERE m.chat_id = ?
+                ORDER BY m.date DESC, m.id DESC
+                LIMIT ?
+            """, (chat_id, limit + 1))
+
+        messages: list[Any] = []
+        has_more = False
+        async for row in cursor_query:
+            if len(messages) == limit:
+                has_more = True
+                break
+            if raw:
+                messages.append(_raw_message(row))
+                continue
+            messages.append(Message(
+                id=row["id"],
+                chat_id=row["chat_id"],
+                sender_id=row["sender_id"],
+                date=row["date"],
+                text=row["text"],
+                reply_to_msg_id=row["reply_to_msg_id"],
+                is_forwarded=bool(row["is_forwarded"]),
+                raw_json=row["raw_json"]
+            ))
 
     # Create next cursor if there are more results
     next_cursor = None
     if has_more and messages:
         last_msg = messages[-1]
         next_cursor = encode_cursor(MessageCursor(
-            last_id=last_msg.id,
-            last_date=last_msg.date.isoformat()
+            last_id=last_msg["id"] if raw else last_msg.id,
+            last_date=last_msg["date"] if raw else last_msg.date_str
         ))
 
     return {
@@ -603,7 +1184,9 @@ async def get_messages_with_filters(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     limit: int = 50,
-    cursor: Optional[str] = None
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+    raw: bool = False
 ) -> dict[str, Any]:
     """Get messages with various filters and pagination.
 
@@ -615,93 +1198,90 @@ async def get_messages_with_filters(
         date_to: Filter messages to this date (ISO format).
         limit: Maximum number of results.
         cursor: Base64 encoded pagination cursor.
+        with_total: Include the total match count in the result. On the
+            first page it rides along as a COUNT(*) OVER () column, so
+            the page and its total cost one query instead of two.
+        raw: Return plain dicts instead of Message instances, skipping
+            per-row dataclass allocation for callers that re-serialize
+            straight to JSON.
 
     Returns:
-        Dictionary with messages list and pagination info.
+        Dictionary with messages list and pagination info (plus
+        total_count when with_total is set).
     """
-    conn = await get_db_connection()
-
     # Decode cursor if provided
     cursor_obj = decode_cursor(cursor) if cursor else None
 
-    # Build query dynamically
-    conditions = []
-    params = []
-
-    if chat_id is not None:
-        conditions.append("m.chat_id = ?")
-        params.append(chat_id)
-
-    if sender_id is not None:
-        conditions.append("m.sender_id = ?")
-        params.append(sender_id)
-
-    if keyword:
-        conditions.append("m.text LIKE ?")
-        params.append(f"%{keyword}%")
-
-    if date_from:
-        conditions.append("m.date >= ?")
-        params.append(date_from)
+    mask, params = _build_message_where(
+        chat_id, sender_id, keyword, date_from, date_to
+    )
 
-    if date_to:
-        conditions.append("m.date <= ?")
-        params.append(date_to)
+    # A window-function total is only correct without the cursor seek
+    # predicate, which narrows the counted rows to the remaining pages.
+    include_total = with_total and cursor_obj is None
 
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-    # Add cursor condition if provided
+    # Add cursor parameters if provided
     if cursor_obj:
-        where_clause += f" AND (m.date < ? OR (m.date = ? AND m.id < ?))"
         params.extend([cursor_obj.last_date, cursor_obj.last_date, cursor_obj.last_id])
 
     params.append(limit + 1)
 
-    query = f"""
-        SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
-               m.reply_to_msg_id, m.is_forwarded, m.raw_json
-        FROM messages m
-        WHERE {where_clause}
-        ORDER BY m.date DESC, m.id DESC
-        LIMIT ?
-    """
-
-    cursor_query = await conn.execute(query, params)
-    rows = await cursor_query.fetchall()
-
-    has_more = len(rows) > limit
-    if has_more:
-        rows = rows[:limit]
-
-    messages = [
-        Message(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            sender_id=row["sender_id"],
-            date=datetime.fromisoformat(row["date"]),
-            text=row["text"],
-            reply_to_msg_id=row["reply_to_msg_id"],
-            is_forwarded=bool(row["is_forwarded"]),
-            raw_json=row["raw_json"]
-        )
-        for row in rows
-    ]
+    query = _filtered_select_sql(mask, cursor_obj is not None, include_total)
+
+    total_count = 0
+    async with acquire_reader() as conn:
+        cursor_query = await conn.execute(query, params)
+        messages: list[Any] = []
+        has_more = False
+        async for row in cursor_query:
+            if include_total and not messages:
+                total_count = row["total_count"]
+            if len(messages) == limit:
+                has_more = True
+                break
+            if raw:
+                messages.append(_raw_message(row))
+                continue
+            messages.append(Message(
+                id=row["id"],
+                chat_id=row["chat_id"],
+                sender_id=row["sender_id"],
+                date=row["date"],
+                text=row["text"],
+                reply_to_msg_id=row["reply_to_msg_id"],
+                is_forwarded=bool(row["is_forwarded"]),
+                raw_json=row["raw_json"]
+            ))
 
     # Create next cursor if there are more results
     next_cursor = None
     if has_more and messages:
         last_msg = messages[-1]
         next_cursor = encode_cursor(MessageCursor(
-            last_id=last_msg.id,
-            last_date=last_msg.date.isoformat()
+            last_id=last_msg["id"] if raw else last_msg.id,
+            last_date=last_msg["date"] if raw else last_msg.date_str
         ))
 
-    return {
+    result = {
         "messages": messages,
         "has_more": has_more,
         "next_cursor": next_cursor
     }
 
+    if with_total:
+        if cursor_obj is not None:
+            # Cursor pages fall back to a standalone count for the full total
+            total_count = await count_messages(
+                chat_id=chat_id,
+                sender_id=sender_id,
+                keyword=keyword,
+                date_from=date_from,
+                date_to=date_to
+            )
+        result["total_count"] = total_count
+
+    return result
+
 
 async def count_messages(
     chat_id: Optional[int] = None,
@@ -722,37 +1302,15 @@ async def count_messages(
     Returns:
         Total count of matching messages.
     """
-    conn = await get_db_connection()
-
-    conditions = []
-    params = []
-
-    if chat_id is not None:
-        conditions.append("m.chat_id = ?")
-        params.append(chat_id)
-
-    if sender_id is not None:
-        conditions.append("m.sender_id = ?")
-        params.append(sender_id)
-
-    if keyword:
-        conditions.append("m.text LIKE ?")
-        params.append(f"%{keyword}%")
-
-    if date_from:
-        conditions.append("m.date >= ?")
-        params.append(date_from)
-
-    if date_to:
-        conditions.append("m.date <= ?")
-        params.append(date_to)
-
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    mask, params = _build_message_where(
+        chat_id, sender_id, keyword, date_from, date_to
+    )
 
-    query = f"SELECT COUNT(*) as count FROM messages m WHERE {where_clause}"
+    query = _count_messages_sql(mask)
 
-    cursor = await conn.execute(query, params)
-    row = await cursor.fetchone()
+    async with acquire_reader() as conn:
+        cursor = await conn.execute(query, params)
+        row = await cursor.fetchone()
 
     return row["count"] if row else 0
 
@@ -764,20 +1322,31 @@ async def search_messages_fulltext(
     query: str,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    raw: bool = False
 ) -> dict[str, Any]:
     """Search messages using full-text search.
 
+    Results are paginated with the same (date, id) seek cursor as the
+    other message endpoints, so SQLite stops scanning once the page is
+    filled instead of materializing and sorting the full match set.
+
     Args:
         query: Search query string.
         date_from: Filter messages from this date (ISO format).
         date_to: Filter messages to this date (ISO format).
         limit: Maximum number of results.
+        cursor: Base64 encoded pagination cursor.
+        raw: Return plain dicts instead of Message instances, skipping
+            per-row dataclass allocation for callers that re-serialize
+            straight to JSON.
 
     Returns:
-        Dictionary with messages list and count.
+        Dictionary with messages list, count, and pagination info.
     """
-    conn = await get_db_connection()
+    # Decode cursor if provided
+    cursor_obj = decode_cursor(cursor) if cursor else None
 
     # Build conditions for FTS
     fts_conditions = ["messages_fts MATCH ?"]
@@ -790,8 +1359,16 @@ async def search_messages_fulltext(
         fts_conditions.append("m.date <= ?")
         fts_params.append(date_to or "9999-12-31T23:59:59")
 
+    if cursor_obj:
+        fts_conditions.append("(m.date < ? OR (m.date = ? AND m.id < ?))")
+        fts_params.extend([
+            cursor_obj.last_date,
+            cursor_obj.last_date,
+            cursor_obj.last_id
+        ])
+
     fts_where = " AND ".join(fts_conditions)
-    fts_params.append(limit)
+    fts_params.append(limit + 1)
 
     fts_query = f"""
         SELECT m.id, m.chat_id, m.sender_id, m.date, m.text,
@@ -803,45 +1380,77 @@ async def search_messages_fulltext(
         LIMIT ?
     """
 
-    cursor = await conn.execute(fts_query, fts_params)
-    rows = await cursor.fetchall()
+    async with acquire_reader() as conn:
+        cursor_query = await conn.execute(fts_query, fts_params)
+        messages: list[Any] = []
+        has_more = False
+        async for row in cursor_query:
+            if len(messages) == limit:
+                has_more = True
+                break
+            if raw:
+                messages.append(_raw_message(row))
+                continue
+            messages.append(Message(
+                id=row["id"],
+                chat_id=row["chat_id"],
+                sender_id=row["sender_id"],
+                date=row["date"],
+                text=row["text"],
+                reply_to_msg_id=row["reply_to_msg_id"],
+                is_forwarded=bool(row["is_forwarded"]),
+                raw_json=row["raw_json"]
+            ))
 
-    messages = [
-        Message(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            sender_id=row["sender_id"],
-            date=datetime.fromisoformat(row["date"]),
-            text=row["text"],
-            reply_to_msg_id=row["reply_to_msg_id"],
-            is_forwarded=bool(row["is_forwarded"]),
-            raw_json=row["raw_json"]
-        )
-        for row in rows
-    ]
+    # Create next cursor if there are more results
+    next_cursor = None
+    if has_more and messages:
+        last_msg = messages[-1]
+        next_cursor = encode_cursor(MessageCursor(
+            last_id=last_msg["id"] if raw else last_msg.id,
+            last_date=last_msg["date"] if raw else last_msg.date_str
+        ))
 
     return {
         "messages": messages,
         "count": len(messages),
-        "has_more": len(messages) == limit
+        "has_more": has_more,
+        "next_cursor": next_cursor
     }
 
 
 # ==================== MEDIA CRUD ====================
 
 
-async def insert_media(media: Media) -> None:
+async def insert_media(media: Media, immediate: bool = False) -> None:
     """Insert media into the database.
 
     Args:
         media: Media entity to insert.
+        immediate: Commit synchronously instead of via the group-commit queue.
     """
-    conn = await get_db_connection()
-    await conn.execute("""
-        INSERT OR REPLACE INTO media (msg_id, chat_id, media_type, media_id)
-        VALUES (?, ?, ?, ?)
-    """, (media.msg_id, media.chat_id, media.media_type, media.media_id))
-    await conn.commit()
+    await _enqueue_write(
+        _SQL_UPSERT_MEDIA,
+        (media.msg_id, media.chat_id, media.media_type, media.media_id),
+        immediate=immediate
+    )
+
+
+async def insert_media_batch(media: list[Media]) -> None:
+    """Insert a batch of media rows in a single transaction.
+
+    Args:
+        media: Media entities to upsert (deduplicated by (msg_id, chat_id)).
+    """
+    if not media:
+        return
+
+    data = [
+        (m.msg_id, m.chat_id, m.media_type, m.media_id)
+        for m in {(m.msg_id, m.chat_id): m for m in media}.values()
+    ]
+    async with write_tx() as conn:
+        await conn.executemany(_SQL_UPSERT_MEDIA, data)
 
 
 async def get_media_by_chat(
@@ -861,8 +1470,6 @@ async def get_media_by_chat(
     Returns:
         Dictionary with media list and pagination info.
     """
-    conn = await get_db_connection()
-
     conditions = ["chat_id = ?"]
     params: list[Any] = [chat_id]
 
@@ -885,22 +1492,20 @@ async def get_media_by_chat(
         LIMIT ?
     """
 
-    cursor_query = await conn.execute(query, params)
-    rows = await cursor_query.fetchall()
-
-    has_more = len(rows) > limit
-    if has_more:
-        rows = rows[:limit]
-
-    media_list = [
-        Media(
-            msg_id=row["msg_id"],
-            chat_id=row["chat_id"],
-            media_type=row["media_type"],
-            media_id=row["media_id"]
-        )
-        for row in rows
-    ]
+    async with acquire_reader() as conn:
+        cursor_query = await conn.execute(query, params)
+        media_list: list[Media] = []
+        has_more = False
+        async for row in cursor_query:
+            if len(media_list) == limit:
+                has_more = True
+                break
+            media_list.append(Media(
+                msg_id=row["msg_id"],
+                chat_id=row["chat_id"],
+                media_type=row["media_type"],
+                media_id=row["media_id"]
+            ))
 
     next_cursor = None
     if has_more and media_list:
@@ -930,8 +1535,6 @@ async def get_media_with_filters(
     Returns:
         Dictionary with media list and pagination info.
     """
-    conn = await get_db_connection()
-
     conditions = []
     params: list[Any] = []
 
@@ -958,22 +1561,20 @@ async def get_media_with_filters(
         LIMIT ?
     """
 
-    cursor_query = await conn.execute(query, params)
-    rows = await cursor_query.fetchall()
-
-    has_more = len(rows) > limit
-    if has_more:
-        rows = rows[:limit]
-
-    media_list = [
-        Media(
-            msg_id=row["msg_id"],
-            chat_id=row["chat_id"],
-            media_type=row["media_type"],
-            media_id=row["media_id"]
-        )
-        for row in rows
-    ]
+    async with acquire_reader() as conn:
+        cursor_query = await conn.execute(query, params)
+        media_list: list[Media] = []
+        has_more = False
+        async for row in cursor_query:
+            if len(media_list) == limit:
+                has_more = True
+                break
+            media_list.append(Media(
+                msg_id=row["msg_id"],
+                chat_id=row["chat_id"],
+                media_type=row["media_type"],
+                media_id=row["media_id"]
+            ))
 
     next_cursor = None
     if has_more and media_list:
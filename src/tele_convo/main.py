@@ -7,11 +7,26 @@ and all operations.
 
 import argparse
 import asyncio
-import logging
 import signal
 import sys
 from typing import Optional
 
+# picologging is a drop-in C reimplementation of stdlib logging; the
+# per-record formatting and lock costs sit on every log call, so use it
+# when installed.
+try:
+    import picologging as logging
+except ImportError:
+    import logging
+
+# uvloop replaces the pure-Python selector event loop with libuv's C
+# implementation; install() makes the asyncio.run below pick it up.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from tele_convo.config import Config, load_config
 from tele_convo.db import close_db, get_db_connection
 from tele_convo.server import start_server as start_ws_server
@@ -134,22 +149,14 @@ class TeleConvoApp:
         if limit is not None:
             await self.run_backfill(limit)
 
-        # Create tasks for listening and server
-        if not no_listen:
-            # Start listening in background
-            listening_task = asyncio.create_task(self.run_listening())
-            self.running_tasks.append(listening_task)
-
-        # Start server
-        server_task = asyncio.create_task(self.run_server())
-        self.running_tasks.append(server_task)
-
-        # Wait for all tasks or shutdown signal
-        if self.running_tasks:
-            try:
-                await asyncio.gather(*self.running_tasks)
-            except asyncio.CancelledError:
-                logger.info("Tasks cancelled")
+        # Run listening and the server under a TaskGroup: structured
+        # cancellation means a failure or cancellation in one task tears
+        # down and awaits the sibling, with no manual gather/cancel
+        # bookkeeping.
+        async with asyncio.TaskGroup() as tg:
+            if not no_listen:
+                self.running_tasks.append(tg.create_task(self.run_listening()))
+            self.running_tasks.append(tg.create_task(self.run_server()))
 
     async def shutdown(self) -> None:
         """Gracefully shutdown the application."""
@@ -159,7 +166,7 @@ class TeleConvoApp:
         for task in self.running_tasks:
             if not task.done():
                 task.cancel()
-        
+
         # Wait for tasks to finish cancelling
         if self.running_tasks:
             await asyncio.gather(*self.running_tasks, return_exceptions=True)
@@ -195,7 +202,10 @@ def parse_args() -> argparse.Namespace:
         choices=["backfill", "listen", "serve", "all"],
         nargs="?",
         default="all",
-        help="Operation mode: backfill (fetch historical), listen (live), serve (WebSocket server), all (default)"
+        help=(
+            "Operation mode: backfill (fetch historical), listen (live), "
+            "serve (WebSocket server), all (default)"
+        )
     )
 
     parser.add_argument(
@@ -244,6 +254,10 @@ async def async_main(args: argparse.Namespace) -> None:
     # Set up signal handler for graceful shutdown
     loop = asyncio.get_running_loop()
 
+    # Eager tasks run synchronously until their first suspension point,
+    # saving one scheduler hop per spawned task.
+    loop.set_task_factory(asyncio.eager_task_factory)
+
     def signal_handler() -> None:
         """Handle shutdown signals."""
         logger.info("Received shutdown signal")
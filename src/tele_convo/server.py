@@ -6,18 +6,56 @@ for querying messages, chats, users, media, and full-text search.
 
 import asyncio
 import json
-import logging
-from typing import Any, Optional
+import time
+from operator import attrgetter
+from typing import Annotated, Any, Optional
 
+import msgspec
 import websockets
 
+# picologging is a drop-in C reimplementation of stdlib logging; the
+# per-record formatting and lock costs sit on every log call, so use it
+# when installed.
+try:
+    import picologging as logging
+except ImportError:
+    import logging
+
+# uvloop replaces the pure-Python selector event loop with libuv's C
+# implementation, a drop-in throughput win for a websocket+DB server.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# orjson parses and serializes several times faster than stdlib json and
+# returns bytes, which websockets sends without a str->bytes re-encode.
+# Stdlib json stays available as a fallback when orjson is not installed.
+# Both paths route unknown types through _jsonrpc_default (below), so
+# handlers can put DB entities into responses without pre-serializing.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_jsonrpc_default)
+except ImportError:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_jsonrpc_default).encode()
+
 from tele_convo.config import Config, load_config
 from tele_convo.db import (
     Chat,
     Media,
     Message,
     User,
-    count_messages,
+    chats_version,
     get_all_chats,
     get_media_with_filters,
     get_messages_with_filters,
@@ -25,11 +63,6 @@ from tele_convo.db import (
     search_users,
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 # JSON-RPC error codes
@@ -46,11 +79,17 @@ DEFAULT_USERS_LIMIT = 50
 DEFAULT_MEDIA_LIMIT = 50
 DEFAULT_SEARCH_LIMIT = 50
 
+# Maximum frames processed concurrently per connection
+MAX_INFLIGHT_FRAMES = 64
+
+
+class JSONRPCError(Exception):
+    """JSON-RPC error object, raisable from method handlers."""
 
-class JSONRPCError:
-    """JSON-RPC error object."""
+    __slots__ = ("code", "message", "data")
 
     def __init__(self, code: int, message: str, data: Optional[Any] = None):
+        super().__init__(message)
         self.code = code
         self.message = message
         self.data = data
@@ -62,14 +101,22 @@ class JSONRPCError:
         return error
 
 
+# Singleton instances for the constant validation failures: raising a
+# shared instance skips re-allocating the same error on every bad input.
+_ERR_CURSOR_INT = JSONRPCError(
+    JSONRPC_INVALID_PARAMS, "cursor must be a valid integer string"
+)
+_ERR_QUERY_REQUIRED = JSONRPCError(JSONRPC_INVALID_PARAMS, "query parameter is required")
+
+
 def create_error_response(
     error: JSONRPCError, request_id: Optional[Any] = None
 ) -> dict[str, Any]:
     """Create a JSON-RPC error response.
 
     Args:
-        error: The JSONRPCError object: The request ID.
-        request_id from the original request.
+        error: The JSONRPCError object.
+        request_id: The request ID from the original request.
 
     Returns:
         JSON-RPC error response dictionary.
@@ -104,6 +151,86 @@ def create_success_response(
     return response
 
 
+# Typed parameter structs for the method handlers. msgspec.convert
+# validates the whole params object in one C-level pass, replacing the
+# per-field .get() chains and isinstance checks the handlers used to
+# repeat. Unknown fields are ignored, matching the old behavior. Limit
+# bounds live in the Annotated constraints, enforced during decode, so
+# the handlers carry no per-call bounds checks.
+BoundedLimit = Annotated[int, msgspec.Meta(gt=0, le=MAX_MESSAGES_LIMIT)]
+PositiveLimit = Annotated[int, msgspec.Meta(gt=0)]
+
+
+class GetMessagesParams(msgspec.Struct, kw_only=True):
+    """Parameters accepted by the getMessages method."""
+    chat_id: Optional[int] = None
+    sender_id: Optional[int] = None
+    keyword: Optional[str] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    limit: BoundedLimit = DEFAULT_MESSAGES_LIMIT
+    cursor: Optional[str] = None
+
+
+class GetUsersParams(msgspec.Struct, kw_only=True):
+    """Parameters accepted by the getUsers method."""
+    keyword: Optional[str] = None
+    limit: PositiveLimit = DEFAULT_USERS_LIMIT
+    cursor: Optional[str] = None
+
+
+class GetMediaParams(msgspec.Struct, kw_only=True):
+    """Parameters accepted by the getMedia method."""
+    chat_id: Optional[int] = None
+    media_type: Optional[str] = None
+    limit: PositiveLimit = DEFAULT_MEDIA_LIMIT
+    cursor: Optional[str] = None
+
+
+class SearchParams(msgspec.Struct, kw_only=True):
+    """Parameters accepted by the search method."""
+    query: str
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    limit: PositiveLimit = DEFAULT_SEARCH_LIMIT
+
+
+def _parse_params(params: Optional[dict[str, Any]], struct_type: type) -> Any:
+    """Validate raw JSON-RPC params against a typed struct.
+
+    Args:
+        params: Raw params object from the request, or None.
+        struct_type: msgspec.Struct subclass to convert into.
+
+    Returns:
+        Populated struct instance.
+
+    Raises:
+        JSONRPCError: If the params fail validation.
+    """
+    try:
+        return msgspec.convert(params or {}, struct_type)
+    except msgspec.ValidationError as e:
+        raise JSONRPCError(JSONRPC_INVALID_PARAMS, str(e))
+
+
+# Precompiled key tuples and attrgetters for the serializers below: one
+# C-level attrgetter call plus dict(zip(...)) replaces eight attribute
+# lookups and a literal dict build per object. Message dates arrive from
+# the DB layer as ISO strings, so they pass through untouched.
+_MSG_KEYS = (
+    "id", "chat_id", "sender_id", "date",
+    "text", "reply_to_msg_id", "is_forwarded", "raw_json",
+)
+_MSG_GETTER = attrgetter(*_MSG_KEYS)
+_CHAT_KEYS = ("id", "title", "username")
+_CHAT_GETTER = attrgetter(*_CHAT_KEYS)
+_USER_KEYS = ("id", "username", "first_name", "last_name")
+_USER_GETTER = attrgetter(*_USER_KEYS)
+_MEDIA_KEYS = ("msg_id", "chat_id", "media_type", "media_id")
+_MEDIA_GETTER = attrgetter(*_MEDIA_KEYS)
+
+
 def serialize_message(message: Message) -> dict[str, Any]:
     """Serialize a Message object to dictionary.
 
@@ -113,16 +240,7 @@ def serialize_message(message: Message) -> dict[str, Any]:
     Returns:
         Dictionary representation of the message.
     """
-    return {
-        "id": message.id,
-        "chat_id": message.chat_id,
-        "sender_id": message.sender_id,
-        "date": message.date.isoformat() if message.date else None,
-        "text": message.text,
-        "reply_to_msg_id": message.reply_to_msg_id,
-        "is_forwarded": message.is_forwarded,
-        "raw_json": message.raw_json,
-    }
+    return dict(zip(_MSG_KEYS, _MSG_GETTER(message)))
 
 
 def serialize_chat(chat: Chat) -> dict[str, Any]:
@@ -134,11 +252,7 @@ def serialize_chat(chat: Chat) -> dict[str, Any]:
     Returns:
         Dictionary representation of the chat.
     """
-    return {
-        "id": chat.id,
-        "title": chat.title,
-        "username": chat.username,
-    }
+    return dict(zip(_CHAT_KEYS, _CHAT_GETTER(chat)))
 
 
 def serialize_user(user: User) -> dict[str, Any]:
@@ -150,12 +264,7 @@ def serialize_user(user: User) -> dict[str, Any]:
     Returns:
         Dictionary representation of the user.
     """
-    return {
-        "id": user.id,
-        "username": user.username,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-    }
+    return dict(zip(_USER_KEYS, _USER_GETTER(user)))
 
 
 def serialize_media(media: Media) -> dict[str, Any]:
@@ -167,12 +276,38 @@ def serialize_media(media: Media) -> dict[str, Any]:
     Returns:
         Dictionary representation of the media.
     """
-    return {
-        "msg_id": media.msg_id,
-        "chat_id": media.chat_id,
-        "media_type": media.media_type,
-        "media_id": media.media_id,
-    }
+    return dict(zip(_MEDIA_KEYS, _MEDIA_GETTER(media)))
+
+
+def _jsonrpc_default(obj: Any) -> Any:
+    """Serialize DB entities encountered during JSON encoding.
+
+    Registered as the dumps default hook so handlers can return raw
+    Chat/User/Message/Media objects; the serializer converts each one as
+    the C encoder walks the response, with no intermediate dict list.
+
+    Args:
+        obj: Object the JSON encoder could not serialize natively.
+
+    Returns:
+        Dictionary representation of the entity (or decoded text for a
+        bytes value such as a stored raw_json blob).
+
+    Raises:
+        TypeError: If the object is not a known entity type.
+    """
+    if isinstance(obj, bytes):
+        # raw_json is stored as UTF-8 bytes; decode only when serving
+        return obj.decode("utf-8")
+    if isinstance(obj, Message):
+        return serialize_message(obj)
+    if isinstance(obj, User):
+        return serialize_user(obj)
+    if isinstance(obj, Chat):
+        return serialize_chat(obj)
+    if isinstance(obj, Media):
+        return serialize_media(obj)
+    raise TypeError(f"Cannot serialize type {type(obj).__name__}")
 
 
 async def handle_get_messages(params: Optional[dict[str, Any]]) -> dict[str, Any]:
@@ -190,73 +325,58 @@ async def handle_get_messages(params: Optional[dict[str, Any]]) -> dict[str, Any
     Returns:
         Dictionary with messages array, next_cursor, has_more, total_count.
     """
-    # Extract parameters
-    chat_id = params.get("chat_id") if params else None
-    sender_id = params.get("sender_id") if params else None
-    keyword = params.get("keyword") if params else None
-    date_from = params.get("date_from") if params else None
-    date_to = params.get("date_to") if params else None
-    limit = params.get("limit", DEFAULT_MESSAGES_LIMIT) if params else DEFAULT_MESSAGES_LIMIT
-    cursor = params.get("cursor") if params else None
-
-    # Validate limit
-    if not isinstance(limit, int):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be an integer"
-        )
-    limit = min(limit, MAX_MESSAGES_LIMIT)
-    if limit <= 0:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be greater than 0"
-        )
+    p = _parse_params(params, GetMessagesParams)
 
-    # Validate cursor if provided
-    if cursor is not None and not isinstance(cursor, str):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "cursor must be a string"
-        )
-
-    # Get messages from database
+    # Get messages from database; with_total folds the total count into
+    # the page query as a window column instead of a second round trip,
+    # and raw=True yields wire-ready dicts straight from the rows, so
+    # the page is never materialized as dataclasses only to be
+    # re-serialized here.
     result = await get_messages_with_filters(
-        chat_id=chat_id,
-        sender_id=sender_id,
-        keyword=keyword,
-        date_from=date_from,
-        date_to=date_to,
-        limit=limit,
-        cursor=cursor
-    )
-
-    # Get total count
-    total_count = await count_messages(
-        chat_id=chat_id,
-        sender_id=sender_id,
-        keyword=keyword,
-        date_from=date_from,
-        date_to=date_to
+        chat_id=p.chat_id,
+        sender_id=p.sender_id,
+        keyword=p.keyword,
+        date_from=p.date_from,
+        date_to=p.date_to,
+        limit=p.limit,
+        cursor=p.cursor,
+        with_total=True,
+        raw=True
     )
 
     return {
-        "messages": [serialize_message(msg) for msg in result["messages"]],
+        "messages": result["messages"],
         "next_cursor": result["next_cursor"],
         "has_more": result["has_more"],
-        "total_count": total_count
+        "total_count": result["total_count"]
     }
 
 
+# Chat membership changes rarely, so getChats serves a short-TTL cache
+# of the serialized list. The cache also keys on the chat-write version
+# counter, so any chat upsert invalidates it before the TTL expires.
+_CHATS_TTL = 5.0
+_chats_cache: Optional[tuple[float, int, list[dict[str, Any]]]] = None
+
+
 async def handle_get_chats(_params: Optional[dict[str, Any]]) -> dict[str, Any]:
     """Handle getChats JSON-RPC method.
 
     Returns:
         Dictionary with chats array.
     """
-    chats = await get_all_chats()
-    return {
-        "chats": [serialize_chat(chat) for chat in chats]
-    }
+    global _chats_cache
+
+    now = time.monotonic()
+    version = chats_version()
+    if _chats_cache is not None:
+        cached_at, cached_version, cached_chats = _chats_cache
+        if cached_version == version and now - cached_at < _CHATS_TTL:
+            return {"chats": cached_chats}
+
+    chats = [serialize_chat(chat) for chat in await get_all_chats()]
+    _chats_cache = (now, version, chats)
+    return {"chats": chats}
 
 
 async def handle_get_users(params: Optional[dict[str, Any]]) -> dict[str, Any]:
@@ -270,31 +390,17 @@ async def handle_get_users(params: Optional[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Dictionary with users array, next_cursor, has_more.
     """
-    # Extract parameters
-    keyword = params.get("keyword") if params else None
-    limit = params.get("limit", DEFAULT_USERS_LIMIT) if params else DEFAULT_USERS_LIMIT
-    cursor = params.get("cursor") if params else None
-
-    # Validate limit
-    if not isinstance(limit, int):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be an integer"
-        )
-    if limit <= 0:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be greater than 0"
-        )
+    p = _parse_params(params, GetUsersParams)
 
     result = await search_users(
-        keyword=keyword,
-        limit=limit,
-        cursor=cursor
+        keyword=p.keyword,
+        limit=p.limit,
+        cursor=p.cursor
     )
 
+    # Raw User objects: the dumps default hook serializes them in-line
     return {
-        "users": [serialize_user(user) for user in result["users"]],
+        "users": result["users"],
         "next_cursor": result.get("next_cursor"),
         "has_more": result["has_more"]
     }
@@ -312,44 +418,26 @@ async def handle_get_media(params: Optional[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Dictionary with media array, next_cursor, has_more.
     """
-    # Extract parameters
-    chat_id = params.get("chat_id") if params else None
-    media_type = params.get("media_type") if params else None
-    limit = params.get("limit", DEFAULT_MEDIA_LIMIT) if params else DEFAULT_MEDIA_LIMIT
-    cursor_str = params.get("cursor") if params else None
+    p = _parse_params(params, GetMediaParams)
 
     # Convert cursor string to int if provided
     cursor = None
-    if cursor_str is not None:
+    if p.cursor is not None:
         try:
-            cursor = int(cursor_str)
+            cursor = int(p.cursor)
         except ValueError:
-            raise JSONRPCError(
-                JSONRPC_INVALID_PARAMS,
-                "cursor must be a valid integer string"
-            )
-
-    # Validate limit
-    if not isinstance(limit, int):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be an integer"
-        )
-    if limit <= 0:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be greater than 0"
-        )
+            raise _ERR_CURSOR_INT
 
     result = await get_media_with_filters(
-        chat_id=chat_id,
-        media_type=media_type,
-        limit=limit,
+        chat_id=p.chat_id,
+        media_type=p.media_type,
+        limit=p.limit,
         cursor=cursor
     )
 
+    # Raw Media objects: the dumps default hook serializes them in-line
     return {
-        "media": [serialize_media(media) for media in result["media"]],
+        "media": result["media"],
         "next_cursor": str(result["next_cursor"]) if result["next_cursor"] else None,
         "has_more": result["has_more"]
     }
@@ -367,65 +455,27 @@ async def handle_search(params: Optional[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Dictionary with results array, has_more.
     """
-    # Validate params
-    if not params:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "query parameter is required"
-        )
-
-    query = params.get("query")
-    if not query:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "query parameter is required"
-        )
-
-    if not isinstance(query, str):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "query must be a string"
-        )
-
-    date_from = params.get("date_from")
-    date_to = params.get("date_to")
-    limit = params.get("limit", DEFAULT_SEARCH_LIMIT)
+    p = _parse_params(params, SearchParams)
 
-    # Validate limit
-    if not isinstance(limit, int):
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be an integer"
-        )
-    if limit <= 0:
-        raise JSONRPCError(
-            JSONRPC_INVALID_PARAMS,
-            "limit must be greater than 0"
-        )
+    if not p.query:
+        raise _ERR_QUERY_REQUIRED
 
+    # raw=True returns wire-ready dicts, skipping the intermediate
+    # Message dataclass page.
     result = await search_messages_fulltext(
-        query=query,
-        date_from=date_from,
-        date_to=date_to,
-        limit=limit
+        query=p.query,
+        date_from=p.date_from,
+        date_to=p.date_to,
+        limit=p.limit,
+        raw=True
     )
 
     return {
-        "results": [serialize_message(msg) for msg in result["messages"]],
+        "results": result["messages"],
         "has_more": result["has_more"]
     }
 
 
-# Method handlers map
-METHOD_HANDLERS = {
-    "getMessages": handle_get_messages,
-    "getChats": handle_get_chats,
-    "getUsers": handle_get_users,
-    "getMedia": handle_get_media,
-    "search": handle_search,
-}
-
-
 async def handle_jsonrpc_request(request: dict[str, Any]) -> dict[str, Any]:
     """Handle a single JSON-RPC request.
 
@@ -435,20 +485,34 @@ async def handle_jsonrpc_request(request: dict[str, Any]) -> dict[str, Any]:
     Returns:
         JSON-RPC response dictionary.
     """
+    req_id = request.get("id")
+
     # Validate JSON-RPC version
     if request.get("jsonrpc") != "2.0":
         return create_error_response(
             JSONRPCError(JSONRPC_INVALID_REQUEST, "Invalid JSON-RPC version"),
-            request.get("id")
+            req_id
         )
 
-    # Validate method exists
+    # Dispatch on the method name; literal match/case compiles to a jump
+    # table, one probe instead of a membership test plus a dict lookup.
     method = request.get("method")
-    if not method or method not in METHOD_HANDLERS:
-        return create_error_response(
-            JSONRPCError(JSONRPC_METHOD_NOT_FOUND, f"Method not found: {method}"),
-            request.get("id")
-        )
+    match method:
+        case "getMessages":
+            handler = handle_get_messages
+        case "getChats":
+            handler = handle_get_chats
+        case "getUsers":
+            handler = handle_get_users
+        case "getMedia":
+            handler = handle_get_media
+        case "search":
+            handler = handle_search
+        case _:
+            return create_error_response(
+                JSONRPCError(JSONRPC_METHOD_NOT_FOUND, f"Method not found: {method}"),
+                req_id
+            )
 
     # Get params
     params = request.get("params")
@@ -457,24 +521,39 @@ async def handle_jsonrpc_request(request: dict[str, Any]) -> dict[str, Any]:
     if params is not None and not isinstance(params, dict):
         return create_error_response(
             JSONRPCError(JSONRPC_INVALID_PARAMS, "Params must be an object or null"),
-            request.get("id")
+            req_id
         )
 
     # Call the method handler
     try:
-        handler = METHOD_HANDLERS[method]
         result = await handler(params)
-        return create_success_response(result, request.get("id"))
+        return create_success_response(result, req_id)
     except JSONRPCError as e:
-        return create_error_response(e, request.get("id"))
+        return create_error_response(e, req_id)
     except Exception as e:
-        logger.exception(f"Error handling method {method}")
+        logger.exception("Error handling method %s", method)
         return create_error_response(
             JSONRPCError(JSONRPC_INTERNAL_ERROR, str(e)),
-            request.get("id")
+            req_id
         )
 
 
+async def handle_jsonrpc_request_bytes(request: dict[str, Any]) -> bytes:
+    """Handle a single JSON-RPC request and serialize the response.
+
+    Fast path for batch assembly: each sub-response is serialized
+    independently and the batch frame is joined from the byte parts, so
+    the outer list is never walked by the JSON encoder a second time.
+
+    Args:
+        request: JSON-RPC request dictionary.
+
+    Returns:
+        Serialized JSON-RPC response.
+    """
+    return _json_dumps(await handle_jsonrpc_request(request))
+
+
 async def handle_websocket_client(websocket: websockets.WebSocketServerProtocol) -> None:
     """Handle a WebSocket client connection.
 
@@ -482,32 +561,54 @@ async def handle_websocket_client(websocket: websockets.WebSocketServerProtocol)
         websocket: WebSocket connection.
     """
     client_addr = websocket.remote_address
-    logger.info(f"Client connected: {client_addr}")
-
-    try:
-        async for message in websocket:
-            logger.debug(f"Received message from {client_addr}: {message}")
-
+    logger.info("Client connected: %s", client_addr)
+
+    # Pre-bind the per-frame names as locals: LOAD_FAST instead of a
+    # global/attribute lookup per reference on every frame.
+    loads = _json_loads
+    dumps = _json_dumps
+    send = websocket.send
+    handle = handle_jsonrpc_request
+    handle_bytes = handle_jsonrpc_request_bytes
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    # Each frame is processed in its own task so a pipelined client is
+    # not serialized behind one slow query; the semaphore caps how many
+    # frames are in flight per connection. JSON-RPC matches responses to
+    # requests by id, so responses may complete out of order.
+    inflight = asyncio.Semaphore(MAX_INFLIGHT_FRAMES)
+    pending: set[asyncio.Task] = set()
+
+    async def process_frame(message: str | bytes) -> None:
+        """Parse one frame, dispatch it and send the response."""
+        try:
             # Parse the incoming JSON
             try:
-                request = json.loads(message)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid JSON from {client_addr}: {e}")
+                request = loads(message)
+            except _JSONDecodeError as e:
+                logger.warning("Invalid JSON from %s: %s", client_addr, e)
                 error_response = create_error_response(
                     JSONRPCError(JSONRPC_PARSE_ERROR, f"Invalid JSON: {str(e)}"),
                     None
                 )
-                await websocket.send(json.dumps(error_response))
-                continue
-
-            # Handle batch requests (array)
+                await send(dumps(error_response))
+                return
+
+            # Handle batch requests (array). Sub-requests run
+            # concurrently: each handler awaits independent DB reads, so
+            # the batch costs the slowest query instead of their sum.
+            # gather preserves order, and handle_jsonrpc_request never
+            # raises (errors come back as JSON-RPC error dicts). Each
+            # sub-response arrives pre-serialized; the batch frame is a
+            # byte join, not a second encoder pass over the outer list.
             if isinstance(request, list):
-                responses = []
-                for req in request:
-                    if isinstance(req, dict):
-                        responses.append(await handle_jsonrpc_request(req))
-                if responses:
-                    await websocket.send(json.dumps(responses))
+                parts = await asyncio.gather(*(
+                    handle_bytes(req)
+                    for req in request
+                    if isinstance(req, dict)
+                ))
+                if parts:
+                    await send(b"[" + b",".join(parts) + b"]")
                 else:
                     error_response = create_error_response(
                         JSONRPCError(
@@ -516,26 +617,44 @@ async def handle_websocket_client(websocket: websockets.WebSocketServerProtocol)
                         ),
                         None
                     )
-                    await websocket.send(json.dumps(error_response))
+                    await send(dumps(error_response))
 
             # Handle single request (object)
             elif isinstance(request, dict):
-                response = await handle_jsonrpc_request(request)
-                await websocket.send(json.dumps(response))
+                response = await handle(request)
+                await send(dumps(response))
 
             else:
                 error_response = create_error_response(
                     JSONRPCError(JSONRPC_INVALID_REQUEST, "Request must be an object or array"),
                     None
                 )
-                await websocket.send(json.dumps(error_response))
+                await send(dumps(error_response))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.exception("Error processing frame from %s: %s", client_addr, e)
+        finally:
+            inflight.release()
+
+    try:
+        async for message in websocket:
+            if debug_enabled:
+                logger.debug("Received message from %s: %s", client_addr, message)
+
+            await inflight.acquire()
+            task = asyncio.create_task(process_frame(message))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
 
     except websockets.exceptions.ConnectionClosed:
-        logger.info(f"Client disconnected: {client_addr}")
+        logger.info("Client disconnected: %s", client_addr)
     except Exception as e:
-        logger.exception(f"Error handling client {client_addr}: {e}")
+        logger.exception("Error handling client %s: %s", client_addr, e)
     finally:
-        logger.info(f"Connection closed: {client_addr}")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Connection closed: %s", client_addr)
 
 
 async def start_server(config: Config) -> None:
@@ -544,14 +663,24 @@ async def start_server(config: Config) -> None:
     Args:
         config: Configuration object with server settings.
     """
-    logger.info(f"Starting WebSocket server on {config.ws_host}:{config.ws_port}")
+    logger.info("Starting WebSocket server on %s:%s", config.ws_host, config.ws_port)
 
+    # permessage-deflate is net-negative for JSON-RPC on localhost/LAN:
+    # zlib runs on the event loop thread and blocks it for multi-KB
+    # frames, so compression is disabled. max_size is raised so large
+    # batch requests fit, and the write buffer is widened to match big
+    # paginated replies.
     async with websockets.serve(
         handle_websocket_client,
         config.ws_host,
-        config.ws_port
+        config.ws_port,
+        compression=None,
+        max_size=8 * 1024 * 1024,
+        write_limit=1 << 20,
+        ping_interval=20,
+        ping_timeout=20
     ):
-        logger.info(f"Server started successfully on ws://{config.ws_host}:{config.ws_port}")
+        logger.info("Server started successfully on ws://%s:%s", config.ws_host, config.ws_port)
         # Keep the server running
         await asyncio.Future()  # Run forever
 
@@ -561,13 +690,19 @@ async def run_server() -> None:
     try:
         config = load_config()
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         return
 
     await start_server(config)
 
 
 if __name__ == "__main__":
+    # Configure logging only when run standalone; the main entry point
+    # owns the configuration otherwise.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
     try:
         asyncio.run(run_server())
     except KeyboardInterrupt:
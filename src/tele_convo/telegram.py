@@ -6,60 +6,162 @@ including historical message backfill and live message listening.
 
 import asyncio
 import json
-import logging
 import random
-from datetime import datetime
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
 from telethon import TelegramClient, events
 from telethon.errors import FloodWaitError, RPCError
 from telethon.tl import types
-from telethon.tl.types import Message, User as TelethonUser, Chat as TelethonChat
+from telethon.tl.types import Message
+from telethon.tl.types import User as TelethonUser
 
 from tele_convo.config import Config
 from tele_convo.db import (
     Chat,
-    User,
-    Message as DBMessage,
     Media,
-    insert_or_update_chat,
-    insert_or_update_user,
+    User,
+    insert_media,
     insert_message,
     insert_messages_batch,
-    insert_media,
+    insert_or_update_chat,
+    insert_or_update_user,
 )
+from tele_convo.db import Message as DBMessage
+
+# picologging is a drop-in C reimplementation of stdlib logging; the
+# per-record formatting and lock costs sit on every log call, so use it
+# when installed.
+try:
+    import picologging as logging
+except ImportError:
+    import logging
+
+# orjson serializes several times faster than stdlib json; every message
+# passes through raw-JSON serialization during backfill, so this is hot.
+# Stdlib json stays available as a fallback when orjson is not installed.
+try:
+    import orjson
+
+    def _dumps_raw(obj: Any) -> bytes:
+        """Serialize a message dict to its raw-JSON UTF-8 bytes form."""
+        try:
+            return orjson.dumps(obj, default=str)
+        except TypeError:
+            # orjson rejects a few types stdlib json tolerates (e.g.
+            # non-str dict keys); fall back rather than drop the message.
+            return json.dumps(obj, default=str).encode("utf-8")
+except ImportError:
+    def _dumps_raw(obj: Any) -> bytes:
+        """Serialize a message dict to its raw-JSON UTF-8 bytes form."""
+        return json.dumps(obj, default=str).encode("utf-8")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.WARNING,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 # Constants
-BACKFILL_CHUNK_SIZE = 100  # Messages per chunk
-MIN_DELAY = 1  # Minimum delay in seconds
-MAX_DELAY = 3  # Maximum delay in seconds
 MAX_RETRIES = 5  # Maximum retries for failed requests
+RATE_LIMIT = 20.0  # Sustained requests per second (Telegram's soft limit)
+RATE_BURST = 40.0  # Requests allowed to burst before pacing kicks in
+RECENT_USERS_MAX = 10000  # Recently-upserted sender ids to remember
+
+# Below this text length (and with no media attached) a message is cheap
+# enough to serialize inline; the thread-pool hop would cost more than
+# the dumps itself.
+_OFFLOAD_TEXT_THRESHOLD = 512
+
+
+class TokenBucket:
+    """Adaptive rate limiter for Telegram API traffic.
+
+    Replenishes ``rate`` tokens per second up to ``burst``; a caller only
+    sleeps when the recent request rate has exhausted the bucket, so a
+    short bursty backfill runs with no delay at all while sustained
+    traffic is paced under Telegram's soft limit.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """Initialize the bucket.
 
+        Args:
+            rate: Tokens replenished per second.
+            burst: Maximum tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens: Number of tokens this request costs.
+        """
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
 
-async def random_delay() -> None:
-    """Add a random delay between API requests to avoid rate limiting."""
-    delay = random.uniform(MIN_DELAY, MAX_DELAY)
-    await asyncio.sleep(delay)
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server signalled a FloodWait."""
+        self._tokens = 0.0
+        self._updated = time.monotonic()
 
 
 async def exponential_backoff(attempt: int, base_delay: float = 1.0) -> float:
-    """Calculate exponential backoff delay.
+    """Calculate exponential backoff delay with jitter.
+
+    The random component desynchronizes clients that hit a rate limit at
+    the same moment, so they do not all retry in lockstep and trip the
+    limit again together.
 
     Args:
         attempt: Current retry attempt number.
         base_delay: Base delay in seconds.
 
     Returns:
-        Exponential backoff delay in seconds.
+        Exponential backoff delay in seconds, jittered by up to one
+        base_delay.
     """
-    return base_delay * (2 ** attempt)
+    return base_delay * (2 ** attempt) + random.uniform(0, base_delay)
+
+
+# Media-type dispatch tables. An exact type() lookup replaces the
+# per-message cascade of isinstance checks (each of which walks the MRO)
+# with a single O(1) dict probe. Note there is no DocumentAttributeVoice
+# in Telethon — voice notes are DocumentAttributeAudio with voice=True —
+# so voice detection happens on the audio attribute's flag.
+_DOC_ATTR_TYPES = {
+    types.DocumentAttributeVideo: "video",
+    types.DocumentAttributeAudio: "audio",
+    types.DocumentAttributeSticker: "sticker",
+}
+
+
+def _document_media_info(media: Any) -> tuple[str, str]:
+    """Classify a document media and return its (type, id) pair."""
+    doc = media.document
+    for attr in doc.attributes:
+        doc_type = _DOC_ATTR_TYPES.get(type(attr))
+        if doc_type is not None:
+            if doc_type == "audio" and getattr(attr, "voice", False):
+                doc_type = "voice"
+            return doc_type, str(doc.id)
+    return "document", str(doc.id)
+
+
+_MEDIA_HANDLERS = {
+    types.Photo: lambda media: ("photo", str(media.photo.id)),
+    types.Document: _document_media_info,
+    types.WebPage: lambda media: ("webpage", str(media.webpage.id)),
+    types.Game: lambda media: ("game", str(media.game.id)),
+    types.Invoice: lambda media: ("invoice", str(media.invoice.title)),
+}
 
 
 class TelegramClientManager:
@@ -78,6 +180,15 @@ class TelegramClientManager:
         self.config = config
         self.client: Optional[TelegramClient] = None
         self.entity: Optional[Any] = None
+        self.input_entity: Optional[Any] = None
+        # Cached entity id: the hot paths stamp every message/media row
+        # with the chat id, and an int attribute is cheaper than
+        # attribute lookups on the full entity object per message.
+        self._chat_id: int = 0
+        self.limiter = TokenBucket(RATE_LIMIT, RATE_BURST)
+        # LRU of sender ids already upserted; repeat senders on an active
+        # channel skip the redundant SQL round trip entirely.
+        self._recent_users: OrderedDict[int, None] = OrderedDict()
 
     async def connect(self) -> TelegramClient:
         """Connect to Telegram using Telethon.
@@ -94,7 +205,7 @@ class TelegramClientManager:
             self.config.api_hash
         )
         await self.client.start()
-        logger.warning(f"Connected to Telegram as session: {self.config.session_name}")
+        logger.warning("Connected to Telegram as session: %s", self.config.session_name)
         return self.client
 
     async def disconnect(self) -> None:
@@ -120,10 +231,14 @@ class TelegramClientManager:
 
         # Resolve the entity (chat/channel)
         self.entity = await self.client.get_entity(group_url)
-        logger.warning(f"Resolved entity: {getattr(self.entity, 'title', 'Unknown')} ({self.entity.id})")
+        self._chat_id = self.entity.id
+        logger.warning(
+            "Resolved entity: %s (%s)",
+            getattr(self.entity, 'title', 'Unknown'), self.entity.id
+        )
         return self.entity
 
-    async def _extract_media_info(self, message: Message) -> Optional[Media]:
+    def _extract_media_info(self, message: Message) -> Optional[Media]:
         """Extract media information from a Telegram message.
 
         Args:
@@ -136,44 +251,17 @@ class TelegramClientManager:
         if media is None:
             return None
 
-        # Determine media type
+        # Determine media type via the precomputed dispatch table
         media_type = "unknown"
         media_id = ""
 
-        if isinstance(media, types.Photo):
-            media_type = "photo"
-            media_id = str(media.photo.id)
-        elif isinstance(media, types.Document):
-            # Get the document type (video, audio, voice, etc.)
-            doc_type = "document"
-            for attr in media.document.attributes:
-                if isinstance(attr, types.DocumentAttributeVideo):
-                    doc_type = "video"
-                    break
-                elif isinstance(attr, types.DocumentAttributeAudio):
-                    doc_type = "audio"
-                    break
-                elif isinstance(attr, types.DocumentAttributeVoice):
-                    doc_type = "voice"
-                    break
-                elif isinstance(attr, types.DocumentAttributeSticker):
-                    doc_type = "sticker"
-                    break
-            media_type = doc_type
-            media_id = str(media.document.id)
-        elif isinstance(media, types.WebPage):
-            media_type = "webpage"
-            media_id = str(media.webpage.id)
-        elif isinstance(media, types.Game):
-            media_type = "game"
-            media_id = str(media.game.id)
-        elif isinstance(media, types.Invoice):
-            media_type = "invoice"
-            media_id = str(media.invoice.title)
+        handler = _MEDIA_HANDLERS.get(type(media))
+        if handler is not None:
+            media_type, media_id = handler(media)
 
         return Media(
             msg_id=message.id,
-            chat_id=self.entity.id if self.entity else 0,
+            chat_id=self._chat_id,
             media_type=media_type,
             media_id=media_id
         )
@@ -199,13 +287,32 @@ class TelegramClientManager:
         if isinstance(sender, (types.Channel, types.Chat)):
             sender_id = sender.id
 
-        # Convert raw message to JSON
+        # Convert raw message to JSON — only when configured to keep it,
+        # and only for messages carrying structure (media, entities, or
+        # forward info) that the columns do not capture. For a plain
+        # text message the structured row already holds everything, so
+        # its raw_json stays NULL and the to_dict() walk — the most
+        # expensive step in the pipeline — is skipped. Large or
+        # media-rich messages expand into deeply nested dicts whose
+        # serialization would otherwise stall the event loop, so push
+        # those to a worker thread; short text messages are serialized
+        # inline because the thread hop costs more than the dumps.
         raw_json = None
-        try:
-            # Get the message as a dictionary for storage
-            raw_json = json.dumps(message.to_dict(), default=str)
-        except Exception as e:
-            logger.warning(f"Failed to serialize message to JSON: {e}")
+        if self.config.store_raw_json and (
+            message.media is not None or message.entities or message.fwd_from
+        ):
+            try:
+                raw_dict = message.to_dict()
+                offload = (
+                    message.media is not None
+                    or len(message.message or "") > _OFFLOAD_TEXT_THRESHOLD
+                )
+                if offload:
+                    raw_json = await asyncio.to_thread(_dumps_raw, raw_dict)
+                else:
+                    raw_json = _dumps_raw(raw_dict)
+            except Exception as e:
+                logger.warning("Failed to serialize message to JSON: %s", e)
 
         # Determine if message is forwarded
         is_forwarded = (
@@ -215,7 +322,7 @@ class TelegramClientManager:
 
         return DBMessage(
             id=message.id,
-            chat_id=self.entity.id if self.entity else 0,
+            chat_id=self._chat_id,
             sender_id=sender_id,
             date=message.date,
             text=message.text or message.message,
@@ -224,7 +331,7 @@ class TelegramClientManager:
             raw_json=raw_json
         )
 
-    async def _process_user(self, sender: Any) -> Optional[User]:
+    def _process_user(self, sender: Any) -> Optional[User]:
         """Process a Telegram user and convert to DB User entity.
 
         Args:
@@ -252,7 +359,7 @@ class TelegramClientManager:
             )
         return None
 
-    async def _process_chat(self) -> Optional[Chat]:
+    def _process_chat(self) -> Optional[Chat]:
         """Process the current entity and convert to DB Chat entity.
 
         Returns:
@@ -267,6 +374,274 @@ class TelegramClientManager:
             username=getattr(self.entity, 'username', None)
         )
 
+    def _remember_user(self, user_id: int) -> None:
+        """Record a sender id as upserted, evicting the oldest past the cap.
+
+        Args:
+            user_id: Sender id that now exists in the users table.
+        """
+        recent = self._recent_users
+        recent[user_id] = None
+        recent.move_to_end(user_id)
+        if len(recent) > RECENT_USERS_MAX:
+            recent.popitem(last=False)
+
+    async def _fetch_producer(
+        self,
+        entity: Any,
+        limit: Optional[int],
+        fetch_queue: asyncio.Queue
+    ) -> int:
+        """Fetch messages from Telegram and feed them to the consumer.
+
+        Iterates the history with ``iter_messages`` — Telethon handles the
+        per-request chunking against Telegram's 100-message API cap — and
+        buffers messages into processing batches of
+        ``config.processing_batch_size`` before handing them off, so the
+        consumer works on large batches with few queue hops. Owns offset
+        tracking, rate-limit delays, and FloodWait handling so the
+        consumer never touches the network. Enqueues
+        ``(total_fetched, messages)`` tuples and a ``None`` sentinel when
+        the history (or the limit) is exhausted.
+
+        Args:
+            entity: The Telegram entity (chat/channel) to fetch from.
+            limit: Maximum total messages to fetch (None for all).
+            fetch_queue: Queue connecting this producer to the consumer.
+
+        Returns:
+            Total number of messages fetched.
+        """
+        total_fetched = 0
+        offset_id = 0
+        batch_count = 0
+        batch_size = self.config.processing_batch_size
+        flood_attempts = 0
+
+        try:
+            while True:
+                # Calculate remaining messages to fetch
+                remaining = None
+                if limit is not None:
+                    remaining = limit - total_fetched
+                    if remaining <= 0:
+                        break
+
+                batch: list[Message] = []
+                try:
+                    async for msg in self.client.iter_messages(
+                        entity,
+                        limit=remaining,
+                        offset_id=offset_id
+                    ):
+                        batch.append(msg)
+                        offset_id = msg.id
+                        total_fetched += 1
+
+                        if len(batch) >= batch_size:
+                            batch_count += 1
+                            logger.warning(
+                                "Batch %d: fetched %d messages (total: %d)",
+                                batch_count, len(batch), total_fetched
+                            )
+                            await fetch_queue.put((total_fetched, batch))
+                            batch = []
+
+                            # Pace against the rate limit; only sleeps
+                            # when the bucket is exhausted
+                            await self.limiter.acquire()
+                except FloodWaitError as e:
+                    # Progress since the last flood resets the retry count
+                    if batch:
+                        await fetch_queue.put((total_fetched, batch))
+                        flood_attempts = 0
+                    flood_attempts += 1
+                    if flood_attempts > MAX_RETRIES:
+                        logger.warning("Giving up after %d FloodWait retries", MAX_RETRIES)
+                        break
+                    # At least the server-mandated wait, jittered upwards
+                    # so parallel clients do not re-enter in lockstep
+                    wait_time = max(e.seconds, await exponential_backoff(flood_attempts))
+                    logger.warning("FloodWaitError: Need to wait %.1f seconds", wait_time)
+                    self.limiter.drain()
+                    await asyncio.sleep(wait_time)
+                    continue
+                except RPCError as e:
+                    logger.warning("RPCError during backfill: %s", e)
+                    if batch:
+                        await fetch_queue.put((total_fetched, batch))
+                    await self.limiter.acquire()
+                    continue
+                except Exception as e:
+                    logger.warning("Error during backfill: %s", e)
+                    if batch:
+                        await fetch_queue.put((total_fetched, batch))
+                    await self.limiter.acquire()
+                    continue
+
+                # History exhausted; flush the final partial batch
+                if batch:
+                    batch_count += 1
+                    logger.warning(
+                        "Batch %d: fetched %d messages (total: %d)",
+                        batch_count, len(batch), total_fetched
+                    )
+                    await fetch_queue.put((total_fetched, batch))
+                break
+        finally:
+            await fetch_queue.put(None)
+
+        return total_fetched
+
+    async def _consume_chunks(
+        self,
+        fetch_queue: asyncio.Queue,
+        pending_users: dict[int, User],
+        all_messages: list[DBMessage],
+        all_media: list[Media],
+        progress_callback: Optional[callable] = None,
+        verbose: bool = False
+    ) -> None:
+        """Process fetched chunks, accumulating entities for batch insert.
+
+        Nothing is written here: users, messages, and media are collected
+        and flushed in batches once the stream ends, so the whole backfill
+        pays a handful of transactions instead of one write per row (and
+        media's foreign key to messages always holds).
+
+        Args:
+            fetch_queue: Queue fed by `_fetch_producer`; a ``None`` item
+                signals the end of the stream.
+            pending_users: Accumulator for sender entities, keyed by id.
+            all_messages: Accumulator for processed message entities.
+            all_media: Accumulator for extracted media entities.
+            progress_callback: Optional callback function called with progress.
+            verbose: Enable verbose per-message output.
+        """
+        # Pick the loop body once: keeping the verbose check out of the
+        # per-message loop spares the branch (and the preview/getattr
+        # work it guards) on every iteration of the silent default path.
+        process_batch = self._process_batch_verbose if verbose else self._process_batch
+
+        while True:
+            item = await fetch_queue.get()
+            if item is None:
+                break
+            total_fetched, messages = item
+
+            await process_batch(messages, pending_users, all_messages, all_media)
+
+            # Call progress callback if provided
+            if progress_callback:
+                # .message is the raw text field; .text re-parses entities
+                last_msg = messages[-1].message or ''
+                progress_callback(total_fetched, last_msg[:50] if verbose else None)
+
+    async def _process_record(
+        self,
+        msg: Message,
+        pending_users: dict[int, User]
+    ) -> Optional[tuple[DBMessage, Optional[User], Optional[Media]]]:
+        """Process one message into a fixed-shape record tuple.
+
+        Args:
+            msg: Telethon message to process.
+            pending_users: Senders already collected this run, keyed by id.
+
+        Returns:
+            A (message, user, media) tuple — user/media are None when the
+            sender is already known or no media is attached — or None if
+            the message should be skipped.
+        """
+        db_message = await self._process_message(msg)
+        if db_message is None:
+            return None
+
+        # Sender: the pending dict dedupes within the run and the LRU
+        # skips ids upserted by earlier runs
+        user = None
+        if (
+            msg.sender
+            and msg.sender.id not in pending_users
+            and msg.sender.id not in self._recent_users
+        ):
+            user = self._process_user(msg.sender)
+
+        return db_message, user, self._extract_media_info(msg)
+
+    async def _process_batch(
+        self,
+        messages: list[Message],
+        pending_users: dict[int, User],
+        all_messages: list[DBMessage],
+        all_media: list[Media]
+    ) -> None:
+        """Process one batch of messages without per-message output.
+
+        Per-message results accumulate in batch-local lists and merge
+        into the shared accumulators with one extend per batch, rather
+        than an attribute-resolved append per item.
+
+        Args:
+            messages: Telethon messages to process.
+            pending_users: Accumulator for sender entities, keyed by id.
+            all_messages: Accumulator for processed message entities.
+            all_media: Accumulator for extracted media entities.
+        """
+        batch_messages: list[DBMessage] = []
+        batch_media: list[Media] = []
+
+        for msg in messages:
+            record = await self._process_record(msg, pending_users)
+            if record is None:
+                continue
+            db_message, user, media = record
+            batch_messages.append(db_message)
+            if user is not None:
+                pending_users[user.id] = user
+            if media is not None:
+                batch_media.append(media)
+
+        all_messages.extend(batch_messages)
+        all_media.extend(batch_media)
+
+    async def _process_batch_verbose(
+        self,
+        messages: list[Message],
+        pending_users: dict[int, User],
+        all_messages: list[DBMessage],
+        all_media: list[Media]
+    ) -> None:
+        """Process one batch of messages, logging each one.
+
+        Args:
+            messages: Telethon messages to process.
+            pending_users: Accumulator for sender entities, keyed by id.
+            all_messages: Accumulator for processed message entities.
+            all_media: Accumulator for extracted media entities.
+        """
+        batch_messages: list[DBMessage] = []
+        batch_media: list[Media] = []
+
+        for msg in messages:
+            record = await self._process_record(msg, pending_users)
+            if record is None:
+                continue
+            db_message, user, media = record
+            batch_messages.append(db_message)
+            if user is not None:
+                pending_users[user.id] = user
+            if media is not None:
+                batch_media.append(media)
+
+            sender_name = getattr(msg.sender, 'first_name', 'Unknown')
+            # .message is the raw text field; .text re-parses entities
+            text_preview = (msg.message or '')[:50]
+            logger.info("  [%s] %s: %s", msg.id, sender_name, text_preview)
+
+        all_messages.extend(batch_messages)
+        all_media.extend(batch_media)
+
     async def backfill_messages(
         self,
         entity: Any,
@@ -276,13 +651,16 @@ class TelegramClientManager:
     ) -> int:
         """Fetch historical messages from a chat/channel in chunks.
 
-        Fetches messages in chunks of 100 with random delays between
-        chunks to avoid rate limiting.
+        Runs a fetch producer and a processing consumer concurrently,
+        connected by a bounded queue: while the producer waits out the
+        inter-chunk rate-limit delay (or a network round trip), the
+        consumer is processing and storing the previous chunks.
 
         Args:
             entity: The Telegram entity (chat/channel) to fetch from.
             limit: Maximum total messages to fetch (None for all).
             progress_callback: Optional callback function called with progress.
+            verbose: Enable verbose per-message output.
 
         Returns:
             Total number of messages fetched and stored.
@@ -292,104 +670,47 @@ class TelegramClientManager:
 
         # Ensure entity is set
         self.entity = entity
+        self._chat_id = entity.id
 
         # First, store the chat information
-        chat = await self._process_chat()
+        chat = self._process_chat()
         if chat:
             await insert_or_update_chat(chat)
-            logger.warning(f"Stored chat: {chat.title}")
+            logger.warning("Stored chat: %s", chat.title)
 
-        total_fetched = 0
         all_messages: list[DBMessage] = []
-        processed_users: set[int] = set()
-
-        # Get messages in chunks
-        offset_id = 0
-        chunk_count = 0
+        all_media: list[Media] = []
+        pending_users: dict[int, User] = {}
 
-        while True:
-            chunk_count += 1
+        # Bounded to a few chunks so a slow consumer applies backpressure
+        # to the producer instead of buffering the whole history.
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
 
-            # Calculate remaining messages to fetch
-            remaining = None
-            if limit is not None:
-                remaining = limit - total_fetched
-                if remaining <= 0:
-                    break
-
-            # Fetch chunk of messages
-            chunk_size = min(BACKFILL_CHUNK_SIZE, remaining) if remaining else BACKFILL_CHUNK_SIZE
-
-            try:
-                messages = await self.client.get_messages(
-                    entity,
-                    limit=chunk_size,
-                    offset_id=offset_id
+        async with asyncio.TaskGroup() as tg:
+            producer_task = tg.create_task(
+                self._fetch_producer(entity, limit, fetch_queue)
+            )
+            tg.create_task(
+                self._consume_chunks(
+                    fetch_queue, pending_users, all_messages, all_media,
+                    progress_callback, verbose
                 )
+            )
 
-                if not messages:
-                    logger.warning("No more messages to fetch")
-                    break
-
-                # Process each message
-                for msg in messages:
-                    # Process and store message
-                    db_message = await self._process_message(msg)
-                    if db_message:
-                        all_messages.append(db_message)
-
-                        # Process sender (user)
-                        if msg.sender and msg.sender.id not in processed_users:
-                            user = await self._process_user(msg.sender)
-                            if user:
-                                await insert_or_update_user(user)
-                                processed_users.add(user.id)
-
-                        # Process media if present
-                        media = await self._extract_media_info(msg)
-                        if media:
-                            await insert_media(media)
-
-                        # Verbose output
-                        if verbose:
-                            sender_name = getattr(msg.sender, 'first_name', 'Unknown')
-                            text_preview = (msg.text or '')[:50]
-                            logger.info(f"  [{msg.id}] {sender_name}: {text_preview}")
-
-                # Update offset to last message ID for next chunk
-                offset_id = messages[-1].id
-
-                total_fetched += len(messages)
-                logger.warning(f"Chunk {chunk_count}: fetched {len(messages)} messages (total: {total_fetched})")
-
-                # Call progress callback if provided
-                if progress_callback:
-                    last_msg = messages[-1].text or '' if messages else ''
-                    progress_callback(total_fetched, last_msg[:50] if verbose else None)
-
-                # Add random delay between chunks to avoid rate limiting
-                await random_delay()
-
-            except FloodWaitError as e:
-                # Handle FloodWaitError with exponential backoff
-                wait_time = e.seconds
-                logger.warning(f"FloodWaitError: Need to wait {wait_time} seconds")
-                await asyncio.sleep(wait_time)
-            except RPCError as e:
-                logger.warning(f"RPCError during backfill: {e}")
-                await random_delay()
-            except Exception as e:
-                logger.warning(f"Error during backfill: {e}")
-                await random_delay()
-
-            # Check if we've reached the limit
-            if limit and total_fetched >= limit:
-                break
+        total_fetched = producer_task.result()
 
-        # Batch insert all messages
-        if all_messages:
-            await insert_messages_batch(all_messages)
-            logger.warning(f"Batch inserted {len(all_messages)} messages")
+        # Flush everything in one transaction: senders and media ride
+        # along with the messages, so the whole backfill pays a single
+        # WAL commit.
+        if all_messages or pending_users or all_media:
+            await insert_messages_batch(
+                all_messages,
+                users=list(pending_users.values()),
+                media=all_media
+            )
+            logger.warning("Batch inserted %d messages", len(all_messages))
+            for user_id in pending_users:
+                self._remember_user(user_id)
 
         return total_fetched
 
@@ -414,9 +735,10 @@ class TelegramClientManager:
 
         # Ensure entity is set
         self.entity = entity
+        self._chat_id = entity.id
 
         # Store the chat information first
-        chat = await self._process_chat()
+        chat = self._process_chat()
         if chat:
             await insert_or_update_chat(chat)
 
@@ -433,49 +755,71 @@ class TelegramClientManager:
                 return
 
             try:
-                # Add random delay to avoid rate limiting
-                await random_delay()
+                # Pace against the rate limit; a burst of incoming
+                # messages is stored immediately until the bucket empties
+                await self.limiter.acquire()
+
+                # Upsert the sender first (unless recently upserted):
+                # messages carry a foreign key to users, so the sender
+                # row must exist before the message insert — the same
+                # users-before-messages order insert_messages_batch uses.
+                sender_id = message.sender.id
+                if sender_id in self._recent_users:
+                    self._recent_users.move_to_end(sender_id)
+                else:
+                    user = self._process_user(message.sender)
+                    if user:
+                        await insert_or_update_user(user)
+                        self._remember_user(user.id)
 
                 # Process and store the message
                 db_message = await self._process_message(message)
                 if db_message:
                     await insert_message(db_message)
-                    
+
                     if verbose:
                         sender_name = getattr(message.sender, 'first_name', 'Unknown')
                         text_preview = (message.text or '')[:100]
-                        logger.info(f"NEW MESSAGE [{message.id}] {sender_name}: {text_preview}")
+                        logger.info(
+                            "NEW MESSAGE [%s] %s: %s",
+                            message.id, sender_name, text_preview
+                        )
                     else:
-                        logger.warning(f"Stored new message: {message.id} from chat {db_message.chat_id}")
-
-                # Process and store the sender
-                user = await self._process_user(message.sender)
-                if user:
-                    await insert_or_update_user(user)
+                        logger.warning(
+                            "Stored new message: %s from chat %s",
+                            message.id, db_message.chat_id
+                        )
 
                 # Process media if present
-                media = await self._extract_media_info(message)
+                media = self._extract_media_info(message)
                 if media:
                     await insert_media(media)
                     if verbose:
-                        logger.info(f"  Media: {media.media_type}")
+                        logger.info("  Media: %s", media.media_type)
 
                 # Call custom message handler if provided
                 if message_handler:
                     message_handler(event)
 
             except FloodWaitError as e:
-                wait_time = e.seconds
-                logger.warning(f"FloodWaitError in listener: Need to wait {wait_time} seconds")
+                # Jitter past the server-mandated wait so concurrent
+                # listeners do not resume in lockstep
+                wait_time = e.seconds + random.uniform(0, 1.0)
+                logger.warning("FloodWaitError in listener: Need to wait %.1f seconds", wait_time)
+                self.limiter.drain()
                 await asyncio.sleep(wait_time)
             except RPCError as e:
-                logger.warning(f"RPCError in listener: {e}")
+                logger.warning("RPCError in listener: %s", e)
             except Exception as e:
-                logger.warning(f"Error handling new message: {e}")
-
-        # Register the event handler
-        self.client.add_event_handler(handle_new_message, events.NewMessage(chats=[entity]))
-        logger.warning(f"Started listening for new messages in chat: {entity.id}")
+                logger.warning("Error handling new message: %s", e)
+
+        # Register the event handler against the resolved input entity:
+        # Telethon's event filter then compares compact input peers per
+        # event instead of re-resolving the full entity each time.
+        input_entity = await self.client.get_input_entity(entity)
+        self.input_entity = input_entity
+        self.client.add_event_handler(handle_new_message, events.NewMessage(chats=[input_entity]))
+        logger.warning("Started listening for new messages in chat: %s", entity.id)
 
     async def run(self) -> None:
         """Run the client (blocking call for live listening).